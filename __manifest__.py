@@ -31,16 +31,32 @@ Technical Details:
     'author': 'Eventiva',
     'website': 'www.eventiva.com',
     'depends': [
+        'bus',
         'product',
         'website_sale',
     ],
     'data': [
         'data/cron_data.xml',
+        'data/server_actions_data.xml',
         'views/product_views.xml',
+        'views/product_attribute_value_sale_window_views.xml',
+        'views/product_sale_window_transition_views.xml',
         'security/ir.model.access.csv',
     ],
+    'assets': {
+        'web.assets_frontend': [
+            'product_variant_dates/static/src/js/sale_window_bus.js',
+        ],
+    },
     'test': [
         'tests/test_product_variant_dates.py',
+        'tests/test_sale_window_metrics.py',
+        'tests/test_archive_dry_run.py',
+        'tests/test_sale_window_transition.py',
+        'tests/test_sale_window_bus.py',
+        'tests/test_availability_feed.py',
+        'tests/test_sale_windows.py',
+        'tests/test_sale_window_tz.py',
     ],
     'demo': [
         'demo/product_variant_dates_demo.xml',
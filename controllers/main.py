@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from werkzeug.exceptions import BadRequest, NotFound
+
+from odoo import SUPERUSER_ID, api, fields, http
+from odoo.http import request
+from odoo.tools import consteq
+
+from ..tools import metrics
+
+
+class ProductVariantDatesController(http.Controller):
+
+    def _check_token(self, param_name, token):
+        """Raise NotFound unless the token matches the given system parameter.
+
+        The token is read from the ``token`` query parameter or from a bearer
+        ``Authorization`` header; routes stay disabled while the parameter is unset.
+        """
+        expected_token = request.env['ir.config_parameter'].sudo().get_param(param_name)
+        if not token:
+            authorization = request.httprequest.headers.get('Authorization', '')
+            if authorization.startswith('Bearer '):
+                token = authorization[len('Bearer '):].strip()
+        if not expected_token or not token or not consteq(token, expected_token):
+            raise NotFound()
+
+    @http.route('/product_variant_dates/metrics', type='http', auth='public', methods=['GET'], csrf=False, sitemap=False)
+    def sale_window_metrics(self, token=None, **kwargs):
+        """Export sale-window state and cron figures in the Prometheus text format.
+
+        The route is disabled until the ``product_variant_dates.metrics_token``
+        system parameter is set.
+        """
+        self._check_token('product_variant_dates.metrics_token', token)
+        aggregates = request.env['product.template'].sudo()._get_sale_window_metrics()
+        return request.make_response(
+            metrics.render_prometheus(aggregates),
+            headers=[('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')],
+        )
+
+    @http.route('/product_variant_dates/feed.<string:fmt>', type='http', auth='public', methods=['GET'], csrf=False, sitemap=False)
+    def availability_feed(self, fmt, token=None, since=None, **kwargs):
+        """Stream the availability feed of published variants as JSON lines or CSV.
+
+        Only products available on the requested website are listed, and
+        sale period labels follow its timezone and the language of the request.
+
+        Protected by the ``product_variant_dates.feed_token`` system parameter.
+        ``since`` (UTC, ``YYYY-MM-DD HH:MM:SS``) restricts the feed to variants
+        changed since then.
+        """
+        self._check_token('product_variant_dates.feed_token', token)
+        if fmt not in ('jsonl', 'csv'):
+            raise NotFound()
+        try:
+            since = fields.Datetime.to_datetime(since) if since else None
+        except ValueError:
+            raise BadRequest('Invalid since parameter')
+
+        # The response is iterated after the request cursor is closed, so the
+        # feed reads through a cursor of its own
+        registry = request.env.registry
+        website_id = request.env['website'].get_current_website().id
+        context = {'website_id': website_id, 'lang': request.env.lang}
+
+        def generate():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, context)
+                yield from env['product.product']._iter_availability_feed(
+                fmt=fmt, since=since, published_only=True, website_id=website_id)
+
+        content_type = 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson; charset=utf-8'
+        return request.make_response(generate(), headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', 'inline; filename="availability.%s"' % fmt),
+        ])
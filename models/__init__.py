@@ -3,4 +3,8 @@
 from . import product_product
 from . import product_template
 from . import product_attribute_value
+from . import product_attribute_value_sale_window
 from . import product_template_attribute_value
+from . import product_sale_window_transition
+from . import website
+from . import product_sale_window_cron_run
@@ -1,8 +1,19 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
+from dateutil.rrule import rrulestr
 from odoo import api, fields, models, _
+from odoo.addons.base.models.res_partner import _tz_get
 from odoo.exceptions import ValidationError
+import logging
+
+from ..tools.sale_period import format_sale_period_info, get_sale_window_tz, get_zone
+
+_logger = logging.getLogger(__name__)
+
+# Fields whose change can move the next sale window transition of an attribute value
+SALE_WINDOW_FIELDS = {'sale_start_date', 'sale_end_date', 'sale_window_ids', 'sale_recurrence_rule',
+                      'sale_recurrence_duration', 'sale_recurrence_tz'}
 
 
 class ProductAttributeValue(models.Model):
@@ -10,11 +21,55 @@ class ProductAttributeValue(models.Model):
 
     sale_start_date = fields.Datetime(
         string='Sale Start Date',
-        help='Date from which this attribute value can be sold. Leave empty for no restriction.'
+        help='Date from which this attribute value can be sold. Leave empty for no restriction. '
+             'With a recurrence rule, start of the first occurrence.'
     )
     sale_end_date = fields.Datetime(
         string='Sale End Date',
-        help='Date after which this attribute value cannot be sold. Leave empty for no restriction.'
+        help='Date after which this attribute value cannot be sold. Leave empty for no restriction. '
+             'With a recurrence rule, no occurrence starts after this date.'
+    )
+    sale_window_ids = fields.One2many(
+        comodel_name='product.attribute.value.sale.window',
+        inverse_name='attribute_value_id',
+        string='Sale Windows',
+        help='Additional periods during which this attribute value can be sold.'
+    )
+    sale_recurrence_rule = fields.Char(
+        string='Sale Recurrence Rule',
+        help='iCalendar RRULE repeating the sale period from the sale start date, e.g. FREQ=WEEKLY;BYDAY=SA.'
+    )
+    sale_recurrence_duration = fields.Float(
+        string='Sale Recurrence Duration',
+        help='Length in hours of each recurring sale period.'
+    )
+    sale_recurrence_tz = fields.Selection(
+        _tz_get,
+        string='Sale Recurrence Timezone',
+        default=lambda self: self.env.user.tz,
+        help='Timezone in which the recurrence repeats, so occurrences keep their local time '
+             'across DST changes. Defaults to UTC when empty.'
+    )
+    # Window in effect now (or the next one, or the last one once all have ended),
+    # kept up to date by the archive cron so variants never expand the schedule
+    sale_window_start = fields.Datetime(
+        string='Current Window Start',
+        compute='_compute_sale_window',
+        store=True,
+        help='Start of the sale window currently in effect.'
+    )
+    sale_window_end = fields.Datetime(
+        string='Current Window End',
+        compute='_compute_sale_window',
+        store=True,
+        help='End of the sale window currently in effect.'
+    )
+    sale_next_transition = fields.Datetime(
+        string='Next Sale Transition',
+        compute='_compute_sale_window',
+        store=True,
+        index=True,
+        help='Next date at which this attribute value starts or stops being sold.'
     )
     is_sale_period_active = fields.Boolean(
         string='Sale Period Active',
@@ -28,37 +83,97 @@ class ProductAttributeValue(models.Model):
         help='Human readable information about the sale period'
     )
 
-    @api.depends('sale_start_date', 'sale_end_date')
+    def _get_sale_recurrence(self):
+        """Return the recurrence rule and the timezone its occurrences repeat in.
+
+        Occurrences are expanded from the sale start date in the local time of
+        ``sale_recurrence_tz``, so they keep their wall-clock time across DST
+        changes and BYDAY matches the local weekday.
+        """
+        self.ensure_one()
+        tz = get_zone(self.sale_recurrence_tz)
+        dtstart = self.sale_start_date.replace(tzinfo=timezone.utc).astimezone(tz)
+        return rrulestr(self.sale_recurrence_rule, dtstart=dtstart), tz
+
+    def _get_sale_window_candidates(self, now):
+        """Return the (start, end) windows relevant at ``now``; None means unbounded."""
+        self.ensure_one()
+        windows = [(window.start_date, window.end_date) for window in self.sale_window_ids]
+        if self.sale_recurrence_rule and self.sale_start_date:
+            duration = timedelta(hours=self.sale_recurrence_duration)
+            rule, tz = self._get_sale_recurrence()
+            local_now = now.replace(tzinfo=timezone.utc).astimezone(tz)
+            if self.sale_end_date and self.sale_end_date <= now:
+                # Once the series is over, its last occurrence stays as a past window
+                latest = rule.before(self.sale_end_date.replace(tzinfo=timezone.utc).astimezone(tz), inc=False)
+            else:
+                latest = rule.before(local_now, inc=True)
+            # Only the occurrences around now matter: the latest one started and the next one
+            for occurrence in (latest, rule.after(local_now)):
+                if not occurrence:
+                    continue
+                occurrence = occurrence.astimezone(timezone.utc).replace(tzinfo=None)
+                if not (self.sale_end_date and occurrence >= self.sale_end_date):
+                    windows.append((occurrence, occurrence + duration))
+        elif self.sale_start_date or self.sale_end_date:
+            windows.append((self.sale_start_date or None, self.sale_end_date or None))
+        return windows
+
+    def _get_sale_window(self, now):
+        """Return the window in effect at ``now`` and the date of the next transition.
+
+        :return: tuple ``(start, end, next_transition)``, False where unbounded
+        """
+        self.ensure_one()
+        windows = self._get_sale_window_candidates(now)
+        current = [w for w in windows if (not w[0] or w[0] <= now) and (not w[1] or now <= w[1])]
+        upcoming = [w for w in windows if w[0] and w[0] > now]
+        past = [w for w in windows if w[1] and w[1] < now]
+        if current:
+            # Of overlapping windows, keep the one lasting longest
+            window = max(current, key=lambda w: w[1] or datetime.max)
+            next_transition = window[1]
+        elif upcoming:
+            window = min(upcoming, key=lambda w: w[0])
+            next_transition = window[0]
+        elif past:
+            window = max(past, key=lambda w: w[1])
+            next_transition = None
+        else:
+            window = (None, None)
+            next_transition = None
+        return window[0] or False, window[1] or False, next_transition or False
+
+    @api.depends('sale_start_date', 'sale_end_date', 'sale_recurrence_rule', 'sale_recurrence_duration',
+                 'sale_recurrence_tz', 'sale_window_ids.start_date', 'sale_window_ids.end_date')
+    def _compute_sale_window(self):
+        """Compute the window in effect and the date of the next transition."""
+        now = fields.Datetime.now()
+        for attr_value in self:
+            (attr_value.sale_window_start,
+             attr_value.sale_window_end,
+             attr_value.sale_next_transition) = attr_value._get_sale_window(now)
+
+    @api.depends('sale_window_start', 'sale_window_end')
     def _compute_is_sale_period_active(self):
         """Compute whether the attribute value is currently within its sale period."""
         now = fields.Datetime.now()
         for attr_value in self:
-            if attr_value.sale_start_date and attr_value.sale_start_date > now:
+            if attr_value.sale_window_start and attr_value.sale_window_start > now:
                 attr_value.is_sale_period_active = False
-            elif attr_value.sale_end_date and attr_value.sale_end_date < now:
+            elif attr_value.sale_window_end and attr_value.sale_window_end < now:
                 attr_value.is_sale_period_active = False
             else:
                 attr_value.is_sale_period_active = True
 
-    @api.depends('sale_start_date', 'sale_end_date')
+    @api.depends('sale_window_end')
+    @api.depends_context('website_id', 'tz', 'lang')
     def _compute_sale_period_info(self):
-        """Compute human readable sale period information."""
+        """Compute human readable sale period information, in the website or user timezone."""
+        tz_name = get_sale_window_tz(self.env)
         for attr_value in self:
-            if attr_value.sale_end_date:
-                # Format date as "1st Jul" style
-                day = attr_value.sale_end_date.day
-                month = attr_value.sale_end_date.strftime('%b')
-                if day in (1, 21, 31):
-                    suffix = 'st'
-                elif day in (2, 22):
-                    suffix = 'nd'
-                elif day in (3, 23):
-                    suffix = 'rd'
-                else:
-                    suffix = 'th'
-                attr_value.sale_period_info = _('Until %d%s %s') % (day, suffix, month)
-            else:
-                attr_value.sale_period_info = ''
+            # Format date as "1st Jul" style
+            attr_value.sale_period_info = format_sale_period_info(self.env, attr_value.sale_window_end, tz_name)
 
     @api.constrains('sale_start_date', 'sale_end_date')
     def _check_sale_dates(self):
@@ -67,3 +182,63 @@ class ProductAttributeValue(models.Model):
             if attr_value.sale_start_date and attr_value.sale_end_date:
                 if attr_value.sale_start_date >= attr_value.sale_end_date:
                     raise ValidationError(_('Sale start date must be before sale end date for attribute value %s.') % attr_value.display_name)
+
+    @api.constrains('sale_recurrence_rule', 'sale_recurrence_duration', 'sale_recurrence_tz', 'sale_start_date')
+    def _check_sale_recurrence(self):
+        """Validate the recurrence rule and its duration."""
+        for attr_value in self.filtered('sale_recurrence_rule'):
+            if not attr_value.sale_start_date:
+                raise ValidationError(_('A sale recurrence rule needs a sale start date for attribute value %s.') % attr_value.display_name)
+            if attr_value.sale_recurrence_duration <= 0:
+                raise ValidationError(_('The sale recurrence duration must be positive for attribute value %s.') % attr_value.display_name)
+            try:
+                attr_value._get_sale_recurrence()
+            except (ValueError, TypeError) as e:
+                raise ValidationError(_('Invalid sale recurrence rule for attribute value %s: %s') % (attr_value.display_name, e))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to schedule the archive cron at the first transition."""
+        attr_values = super().create(vals_list)
+        attr_values._trigger_sale_window_cron()
+        return attr_values
+
+    def write(self, vals):
+        """Override write to schedule the archive cron when sale windows change."""
+        result = super().write(vals)
+        if SALE_WINDOW_FIELDS & set(vals):
+            self._trigger_sale_window_cron()
+        return result
+
+    def _trigger_sale_window_cron(self):
+        """Schedule the archive cron at the earliest upcoming transition of these values.
+
+        Transitions are precomputed cut-over instants, so variants flip when
+        their window starts or ends instead of at the next hourly run.
+        """
+        now = fields.Datetime.now()
+        transitions = [transition for transition in self.mapped('sale_next_transition') if transition and transition > now]
+        cron = self.env.ref('product_variant_dates.cron_archive_inactive_variants', raise_if_not_found=False)
+        if transitions and cron:
+            cron.sudo()._trigger(at=min(transitions))
+
+    @api.model
+    def _get_pending_sale_window_values(self, now=None):
+        """Return the values whose next transition has passed, archived ones included."""
+        return self.with_context(active_test=False).search([
+            ('sale_next_transition', '<=', now or fields.Datetime.now()),
+        ])
+
+    @api.model
+    def _cron_advance_sale_windows(self):
+        """Recompute the current window of the values whose next transition has passed.
+
+        Called by the archive pass with ``skip_archiving`` in the context, so
+        that the variants taking the new dates are archived and logged by the
+        pass itself rather than by propagation.
+        """
+        attr_values = self._get_pending_sale_window_values()
+        if attr_values:
+            attr_values._compute_sale_window()
+            _logger.info(f"Advanced sale windows of {len(attr_values)} attribute values")
+        return len(attr_values)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+
+
+class ProductAttributeValueSaleWindow(models.Model):
+    _name = 'product.attribute.value.sale.window'
+    _description = 'Attribute Value Sale Window'
+    _order = 'attribute_value_id, start_date'
+
+    attribute_value_id = fields.Many2one(
+        comodel_name='product.attribute.value',
+        string='Attribute Value',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    start_date = fields.Datetime(
+        string='Start Date',
+        required=True,
+        help='Date from which the attribute value can be sold in this window.'
+    )
+    end_date = fields.Datetime(
+        string='End Date',
+        required=True,
+        help='Date after which the attribute value cannot be sold in this window.'
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to schedule the archive cron at the new transitions."""
+        windows = super().create(vals_list)
+        windows.attribute_value_id._trigger_sale_window_cron()
+        return windows
+
+    def write(self, vals):
+        """Override write to schedule the archive cron at the new transitions."""
+        result = super().write(vals)
+        self.attribute_value_id._trigger_sale_window_cron()
+        return result
+
+    @api.constrains('start_date', 'end_date')
+    def _check_dates(self):
+        """Validate that start date is before end date."""
+        for window in self:
+            if window.start_date >= window.end_date:
+                raise ValidationError(_('Sale window start date must be before its end date for attribute value %s.') % window.attribute_value_id.display_name)
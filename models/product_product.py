@@ -1,12 +1,26 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+import csv
+import io
+import json
 import logging
 
+from ..tools import metrics
+from ..tools.sale_period import format_sale_period_info, get_sale_window_tz
+
 _logger = logging.getLogger(__name__)
 
+# Columns of the availability feed, in CSV order
+AVAILABILITY_FEED_COLUMNS = [
+    'product_id', 'product_tmpl_id', 'default_code', 'name', 'active',
+    'sale_start_date', 'sale_end_date', 'sale_period_info', 'write_date',
+]
+AVAILABILITY_FEED_CHUNK_SIZE = 5000
+
 
 class ProductProduct(models.Model):
     _inherit = 'product.product'
@@ -35,6 +49,13 @@ class ProductProduct(models.Model):
         compute='_compute_sale_period_info',
         help='Human readable information about the sale period'
     )
+    sale_window_archived = fields.Boolean(
+        string='Archived by Sale Window',
+        readonly=True,
+        copy=False,
+        help='Set when the variant was archived because it was out of its sale window, '
+             'so that it is reactivated when its window opens. Cleared by any other change of the active flag.'
+    )
 
     # Override the variant_ribbon_id to be editable but with default based on sale period
     variant_ribbon_id = fields.Many2one(
@@ -43,37 +64,41 @@ class ProductProduct(models.Model):
         help='Ribbon displayed on the website. Leave empty for automatic sale period ribbon.'
     )
 
-    @api.depends('product_template_attribute_value_ids.product_attribute_value_id.sale_start_date', 'product_template_attribute_value_ids.product_attribute_value_id.sale_end_date')
+    @api.depends('product_template_attribute_value_ids.product_attribute_value_id.sale_window_start', 'product_template_attribute_value_ids.product_attribute_value_id.sale_window_end')
     def _compute_sale_dates_from_attributes(self):
-        """Compute sale dates from attribute value dates."""
+        """Compute sale dates from the windows in effect on the attribute values."""
         for variant in self:
-            # Get all attribute values for this variant
-            attr_values = variant.product_template_attribute_value_ids
-
-            if not attr_values:
-                variant.sale_start_date = False
-                variant.sale_end_date = False
-                continue
-
-            # Get dates from the underlying product.attribute.value records
-            start_dates = []
-            end_dates = []
-
-            for ptav in attr_values:
-                if ptav.product_attribute_value_id:
-                    if ptav.product_attribute_value_id.sale_start_date:
-                        start_dates.append(ptav.product_attribute_value_id.sale_start_date)
-                    if ptav.product_attribute_value_id.sale_end_date:
-                        end_dates.append(ptav.product_attribute_value_id.sale_end_date)
-
-            # Use the earliest start date and latest end date (least restrictive for variant)
-            variant.sale_start_date = min(start_dates) if start_dates else False
-            variant.sale_end_date = max(end_dates) if end_dates else False
+            variant.sale_start_date, variant.sale_end_date = variant._get_sale_dates_from_attributes()
+
+    def _get_sale_dates_from_attributes(self, windows=None):
+        """Return the (start, end) sale dates of the variant, False where unbounded.
+
+        :param dict windows: optional ``{attribute value id: (start, end)}`` used
+                             instead of the stored window of those values
+        """
+        self.ensure_one()
+        windows = windows or {}
+        # Get dates from the underlying product.attribute.value records
+        start_dates = []
+        end_dates = []
+
+        for ptav in self.product_template_attribute_value_ids:
+            attr_value = ptav.product_attribute_value_id
+            if attr_value:
+                start, end = windows.get(attr_value.id, (attr_value.sale_window_start, attr_value.sale_window_end))
+                if start:
+                    start_dates.append(start)
+                if end:
+                    end_dates.append(end)
+
+        # Use the earliest start date and latest end date (least restrictive for variant)
+        return (min(start_dates) if start_dates else False, max(end_dates) if end_dates else False)
 
     @api.depends('sale_start_date', 'sale_end_date')
     def _compute_is_sale_period_active(self):
         """Compute whether the variant is currently within its sale period."""
         now = fields.Datetime.now()
+        changed_variants = self.browse()
         for variant in self:
             # Store previous state for comparison
             was_sale_period_active = variant.is_sale_period_active
@@ -89,38 +114,32 @@ class ProductProduct(models.Model):
             if (was_sale_period_active != variant.is_sale_period_active and
                 not self.env.context.get('skip_archiving') and
                 variant.id):  # Only for existing variants, not during creation
-                variant._update_variant_archiving()
+                changed_variants |= variant
+
+        if changed_variants:
+            changed_variants._update_variant_archiving()
 
     @api.depends('sale_start_date', 'sale_end_date')
+    @api.depends_context('website_id', 'tz', 'lang')
     def _compute_sale_period_info(self):
-        """Compute human readable sale period information."""
+        """Compute human readable sale period information, in the website or user timezone."""
+        tz_name = get_sale_window_tz(self.env)
         for variant in self:
-            if variant.sale_end_date:
-                # Format date as "1st Jul" style
-                day = variant.sale_end_date.day
-                month = variant.sale_end_date.strftime('%b')
-                if day in (1, 21, 31):
-                    suffix = 'st'
-                elif day in (2, 22):
-                    suffix = 'nd'
-                elif day in (3, 23):
-                    suffix = 'rd'
-                else:
-                    suffix = 'th'
-                variant.sale_period_info = _('Until %d%s %s') % (day, suffix, month)
-            else:
-                variant.sale_period_info = ''
+            # Format date as "1st Jul" style
+            variant.sale_period_info = format_sale_period_info(self.env, variant.sale_end_date, tz_name)
 
     def _get_default_variant_ribbon(self):
         """Get or create a default ribbon based on variant sale period."""
         if self.sale_end_date:
-            # Create a unique ribbon name for this variant
-            variant_ribbon_name = f"{self.sale_period_info}"
+            # Create a unique ribbon name for this variant, in the timezone of its website
+            website = self.product_tmpl_id.website_id or self.env['website'].get_current_website()
+            variant_ribbon_name = format_sale_period_info(self.env, self.sale_end_date, website._get_sale_window_tz())
 
             # Create or get a ribbon for the variant sale period
             ribbon = self.env['product.ribbon'].search([
                 ('name', '=', variant_ribbon_name)
             ], limit=1)
+            metrics.record_ribbon_lookup('variant', bool(ribbon))
 
             if not ribbon:
                 # Create a new ribbon for this variant sale period
@@ -144,10 +163,23 @@ class ProductProduct(models.Model):
 
     def write(self, vals):
         """Override write to update ribbon when sale dates change."""
+        # Archiving done by the sale window logic is logged by its caller
+        log_transitions = 'active' in vals and not self.env.context.get('skip_archiving')
+        if log_transitions:
+            # Archived or reactivated by hand: the sale window no longer owns the state
+            vals = dict(vals, sale_window_archived=False)
+            previous_states = {variant.id: variant.active for variant in self}
         result = super().write(vals)
+        if log_transitions:
+            self.env['product.sale.window.transition']._log_transitions('product.product', [
+                (variant.id, previous_states[variant.id], variant.active)
+                for variant in self
+                if previous_states[variant.id] != variant.active
+            ], 'write')
         # Update ribbon if sale dates changed and no manual ribbon is set
-        if not self.variant_ribbon_id and self.sale_end_date:
-            self.variant_ribbon_id = self._get_default_variant_ribbon()
+        for variant in self:
+            if not variant.variant_ribbon_id and variant.sale_end_date:
+                variant.variant_ribbon_id = variant._get_default_variant_ribbon()
         return result
 
     def update_variant_ribbons(self):
@@ -161,17 +193,57 @@ class ProductProduct(models.Model):
 
     def _update_variant_archiving(self):
         """Update variant archiving based on sale period status."""
+        to_archive = self.filtered(lambda variant: not variant.is_sale_period_active and variant.active)
+        to_reactivate = self.filtered(lambda variant: variant.is_sale_period_active and not variant.active)
         try:
-            if not self.is_sale_period_active and self.active:
-                # Archive variant if sale period is inactive
-                self.with_context(skip_archiving=True).write({'active': False})
-                _logger.info(f"Archived variant {self.id} (sale period inactive)")
-            elif self.is_sale_period_active and not self.active:
-                # Reactivate variant if sale period is active
-                self.with_context(skip_archiving=True).write({'active': True})
-                _logger.info(f"Reactivated variant {self.id} (sale period active)")
+            # Archive variants if sale period is inactive
+            if to_archive:
+                to_archive.with_context(skip_archiving=True).write({'active': False, 'sale_window_archived': True})
+            # Reactivate variants if sale period is active
+            if to_reactivate:
+                to_reactivate.with_context(skip_archiving=True).write({'active': True, 'sale_window_archived': False})
         except Exception as e:
-            _logger.warning(f"Error updating variant {self.id} archiving: {e}")
+            _logger.warning(f"Error updating variants {self.ids} archiving: {e}")
+            return
+        transitions = (
+            [(variant_id, True, False) for variant_id in to_archive.ids]
+            + [(variant_id, False, True) for variant_id in to_reactivate.ids]
+        )
+        self.env['product.sale.window.transition']._log_transitions('product.product', transitions, 'propagation')
+        self._notify_sale_window_transitions(transitions)
+
+    @api.model
+    def _notify_sale_window_transitions(self, transitions):
+        """Publish archived/reactivated variants to open product pages, one bus message per template.
+
+        Each message holds the variant ids and their attribute value
+        combinations, so pages can mark every option leading to an archived variant.
+
+        :param transitions: iterable of ``(variant_id, old_active, new_active)``
+        """
+        new_states = {variant_id: new_active for variant_id, old_active, new_active in transitions if old_active != new_active}
+        if not new_states:
+            return
+        payloads = {}
+        for variant in self.env['product.product'].with_context(active_test=False).browse(list(new_states)):
+            payload = payloads.setdefault(variant.product_tmpl_id.id, {
+                'template_id': variant.product_tmpl_id.id,
+                'archived_product_ids': [],
+                'reactivated_product_ids': [],
+                'archived_combinations': [],
+                'reactivated_combinations': [],
+            })
+            # Combinations (attribute value ids) let the page mark the options
+            # leading to an archived variant, not only the selected variant
+            state = 'reactivated' if new_states[variant.id] else 'archived'
+            payload['%s_product_ids' % state].append(variant.id)
+            payload['%s_combinations' % state].append(variant.product_template_attribute_value_ids.ids)
+        for template_id, payload in payloads.items():
+            self.env['bus.bus']._sendone(
+                self.env['product.template']._get_sale_window_bus_channel(template_id),
+                'product_variant_dates/sale_window',
+                payload,
+            )
 
     def _get_combination_info_variant(self):
         """Override to include sale period information."""
@@ -183,17 +255,123 @@ class ProductProduct(models.Model):
         return info
 
     @api.model
-    def _force_archive_inactive_variants(self):
-        """Force archiving of variants with inactive sale periods."""
-        _logger.info("Forcing archive of inactive variants...")
+    def _get_sale_window_transitions(self, now=None, sale_dates=None):
+        """Compute the variants the archive pass has to touch, in one read-only query.
+
+        A variant is within its sale window unless its start date is in the
+        future or its end date is in the past, as in ``_compute_is_sale_period_active``.
+        Only active variants are archived. An archived variant is only
+        reactivated when its template is active and it was archived by the
+        cron or by propagation (``sale_window_archived``), so variants archived
+        by hand or by variant creation stay archived.
+
+        :param dict sale_dates: optional ``{variant id: (start, end)}`` used
+                                instead of the stored sale dates of those variants
+        :return: dict with the sorted ids to archive, to reactivate, and whose
+                 stored ``is_sale_period_active`` flag is out of date
+        """
+        now = now or fields.Datetime.now()
+        self.flush_model(['product_tmpl_id', 'active', 'sale_start_date', 'sale_end_date',
+                          'is_sale_period_active', 'sale_window_archived'])
+        self.env['product.template'].flush_model(['active'])
+        if sale_dates:
+            overrides = SQL("VALUES %s", SQL(', ').join(
+                SQL("(%s, %s::timestamp, %s::timestamp)", variant_id, start or None, end or None)
+                for variant_id, (start, end) in sorted(sale_dates.items())
+            ))
+        else:
+            overrides = SQL("SELECT NULL::integer, NULL::timestamp, NULL::timestamp WHERE FALSE")
+        self.env.cr.execute(SQL(
+            """
+            SELECT variant.id, variant.active, variant.in_window,
+                   variant.is_sale_period_active IS DISTINCT FROM variant.in_window
+              FROM (SELECT pp.id, pp.active, pp.is_sale_period_active, pp.sale_window_archived,
+                           pt.active AS template_active,
+                           NOT (COALESCE(dates.sale_start_date > %(now)s, FALSE)
+                                OR COALESCE(dates.sale_end_date < %(now)s, FALSE)) AS in_window
+                      FROM %(table)s pp
+                      JOIN product_template pt ON pt.id = pp.product_tmpl_id
+                      LEFT JOIN (%(overrides)s) AS override (id, sale_start_date, sale_end_date)
+                             ON override.id = pp.id
+                     CROSS JOIN LATERAL (SELECT CASE WHEN override.id IS NULL THEN pp.sale_start_date
+                                                     ELSE override.sale_start_date END AS sale_start_date,
+                                                CASE WHEN override.id IS NULL THEN pp.sale_end_date
+                                                     ELSE override.sale_end_date END AS sale_end_date) AS dates
+                   ) AS variant
+             WHERE (variant.active AND (NOT variant.in_window
+                                        OR variant.is_sale_period_active IS DISTINCT FROM variant.in_window))
+                OR (NOT variant.active AND variant.in_window AND variant.template_active
+                    AND variant.sale_window_archived)
+             ORDER BY variant.id
+            """,
+            now=now,
+            table=SQL.identifier(self._table),
+            overrides=overrides,
+        ))
+        transitions = {'archive_ids': [], 'reactivate_ids': [], 'stale_ids': []}
+        for variant_id, active, in_window, stale in self.env.cr.fetchall():
+            if active and not in_window:
+                transitions['archive_ids'].append(variant_id)
+            elif in_window and not active:
+                transitions['reactivate_ids'].append(variant_id)
+            if stale:
+                transitions['stale_ids'].append(variant_id)
+        return transitions
 
-        # Find all variants that need to be checked
-        variants = self.env['product.product'].search([
-            ('product_tmpl_id', '!=', False),
+    @api.model
+    def _get_pending_sale_dates(self, now):
+        """Simulate the window advance of the archive pass, without writing anything.
+
+        :return: ``{variant id: (start, end)}`` sale dates the variants of the
+                 values whose next transition has passed would take
+        """
+        attr_values = self.env['product.attribute.value']._get_pending_sale_window_values(now)
+        windows = {attr_value.id: attr_value._get_sale_window(now)[:2] for attr_value in attr_values}
+        variants = self.with_context(active_test=False).search([
+            ('product_template_attribute_value_ids.product_attribute_value_id', 'in', attr_values.ids),
         ])
+        return {variant.id: variant._get_sale_dates_from_attributes(windows) for variant in variants}
+
+    @api.model
+    def _force_archive_inactive_variants(self, dry_run=False, sample_size=10):
+        """Force archiving of variants with inactive sale periods.
+
+        Attribute values whose next transition has passed are first moved to
+        their new window. With ``dry_run`` nothing is written: that move is
+        simulated, and the planned archive/reactivate ids are returned with
+        their counts and a sample of display names.
+        """
+        now = fields.Datetime.now()
+        if dry_run:
+            transitions = self._get_sale_window_transitions(now, sale_dates=self._get_pending_sale_dates(now))
+            variants = self.env['product.product'].with_context(active_test=False)
+            return {
+                'archived': len(transitions['archive_ids']),
+                'reactivated': len(transitions['reactivate_ids']),
+                'archive_ids': transitions['archive_ids'],
+                'reactivate_ids': transitions['reactivate_ids'],
+                'sample': {
+                    'archive': variants.browse(transitions['archive_ids'][:sample_size]).mapped('display_name'),
+                    'reactivate': variants.browse(transitions['reactivate_ids'][:sample_size]).mapped('display_name'),
+                },
+            }
+
+        # The variants take their new dates when the query below flushes them:
+        # skip_archiving keeps them from archiving themselves by propagation,
+        # so the pass archives, counts and logs them
+        archiving = self.with_context(skip_archiving=True)
+        archiving.env['product.attribute.value']._cron_advance_sale_windows()
+        transitions = archiving._get_sale_window_transitions(now)
+
+        _logger.info("Forcing archive of inactive variants...")
+
+        # Only the variants whose state or stored flag no longer match their sale window
+        variant_ids = set(transitions['archive_ids']) | set(transitions['reactivate_ids']) | set(transitions['stale_ids'])
+        variants = self.env['product.product'].with_context(active_test=False).browse(sorted(variant_ids))
 
         archived_count = 0
         reactivated_count = 0
+        transitions_log = []
 
         for variant in variants:
             try:
@@ -202,20 +380,146 @@ class ProductProduct(models.Model):
 
                 # Check if variant should be archived/reactivated
                 if not variant.is_sale_period_active and variant.active:
-                    variant.with_context(skip_archiving=True).write({'active': False})
+                    variant.with_context(skip_archiving=True).write({'active': False, 'sale_window_archived': True})
                     archived_count += 1
-                    _logger.info(f"Archived variant {variant.id} - {variant.display_name}")
+                    transitions_log.append((variant.id, True, False))
                 elif variant.is_sale_period_active and not variant.active:
-                    variant.with_context(skip_archiving=True).write({'active': True})
+                    variant.with_context(skip_archiving=True).write({'active': True, 'sale_window_archived': False})
                     reactivated_count += 1
-                    _logger.info(f"Reactivated variant {variant.id} - {variant.display_name}")
+                    transitions_log.append((variant.id, False, True))
 
             except Exception as e:
                 _logger.warning(f"Error processing variant {variant.id}: {e}")
                 continue
 
+        self.env['product.sale.window.transition']._log_transitions('product.product', transitions_log, 'cron')
+        self._notify_sale_window_transitions(transitions_log)
         _logger.info(f"Archive complete: {archived_count} archived, {reactivated_count} reactivated")
         return {
             'archived': archived_count,
             'reactivated': reactivated_count
         }
+
+    @api.model
+    def action_preview_archive_inactive_variants(self):
+        """Show what the next archive run would change, without changing anything."""
+        result = self._force_archive_inactive_variants(dry_run=True)
+        lines = [_('%d variant(s) to archive, %d to reactivate.') % (result['archived'], result['reactivated'])]
+        if result['sample']['archive']:
+            lines.append(_('Archive: %s') % ', '.join(result['sample']['archive']))
+        if result['sample']['reactivate']:
+            lines.append(_('Reactivate: %s') % ', '.join(result['sample']['reactivate']))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Sale Window Archiving Preview'),
+                'message': '\n'.join(lines),
+                'sticky': True,
+                'type': 'info',
+            },
+        }
+
+    @api.model
+    def _iter_availability_feed_rows(self, since=None, published_only=False, website_id=None,
+                                     chunk_size=AVAILABILITY_FEED_CHUNK_SIZE):
+        """Yield availability feed rows of saleable variants, archived ones included.
+
+        Rows are read straight from the database in keyset-paginated chunks
+        (``id > last id``), so memory use does not grow with the catalog.
+
+        :param datetime since: only variants or templates written since then
+        :param bool published_only: only variants of website-published templates
+        :param int website_id: only variants of templates available on that
+                               website, i.e. bound to it or to no website
+        """
+        self.flush_model(['product_tmpl_id', 'default_code', 'active', 'sale_start_date', 'sale_end_date'])
+        self.env['product.template'].flush_model(['name', 'sale_ok', 'is_published', 'website_id'])
+        lang = self.env.lang or 'en_US'
+        tz_name = get_sale_window_tz(self.env)
+        conditions = [SQL('pt.sale_ok')]
+        if published_only:
+            conditions.append(SQL('pt.is_published'))
+        if website_id:
+            conditions.append(SQL('(pt.website_id IS NULL OR pt.website_id = %s)', website_id))
+        if since:
+            conditions.append(SQL('(pp.write_date >= %s OR pt.write_date >= %s)', since, since))
+        last_id = 0
+        while True:
+            self.env.cr.execute(SQL(
+                """
+                SELECT pp.id, pp.product_tmpl_id, pp.default_code,
+                       COALESCE(pt.name->>%(lang)s, pt.name->>'en_US'),
+                       pp.active, pp.sale_start_date, pp.sale_end_date,
+                       GREATEST(pp.write_date, pt.write_date)
+                  FROM product_product pp
+                  JOIN product_template pt ON pt.id = pp.product_tmpl_id
+                 WHERE pp.id > %(last_id)s AND %(conditions)s
+                 ORDER BY pp.id
+                 LIMIT %(limit)s
+                """,
+                lang=lang,
+                last_id=last_id,
+                conditions=SQL(' AND ').join(conditions),
+                limit=chunk_size,
+            ))
+            rows = self.env.cr.fetchall()
+            for variant_id, template_id, default_code, name, active, start, end, write_date in rows:
+                yield {
+                    'product_id': variant_id,
+                    'product_tmpl_id': template_id,
+                    'default_code': default_code or '',
+                    'name': name,
+                    'active': active,
+                    'sale_start_date': start and start.replace(tzinfo=timezone.utc).isoformat(),
+                    'sale_end_date': end and end.replace(tzinfo=timezone.utc).isoformat(),
+                    'sale_period_info': format_sale_period_info(self.env, end, tz_name),
+                    'write_date': write_date and write_date.replace(tzinfo=timezone.utc).isoformat(),
+                }
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
+    @api.model
+    def _iter_availability_feed(self, fmt='jsonl', since=None, published_only=False, website_id=None):
+        """Yield the availability feed as text chunks, one per database chunk.
+
+        :param str fmt: ``'jsonl'`` or ``'csv'``
+        """
+        if fmt not in ('jsonl', 'csv'):
+            raise ValidationError(_('Unsupported availability feed format: %s') % fmt)
+        buffer = io.StringIO()
+        writer = None
+        if fmt == 'csv':
+            writer = csv.DictWriter(buffer, fieldnames=AVAILABILITY_FEED_COLUMNS, lineterminator='\n')
+            writer.writeheader()
+        count = 0
+        for row in self._iter_availability_feed_rows(since=since, published_only=published_only, website_id=website_id):
+            if writer:
+                writer.writerow(dict(row, sale_start_date=row['sale_start_date'] or '',
+                                     sale_end_date=row['sale_end_date'] or '',
+                                     write_date=row['write_date'] or ''))
+            else:
+                buffer.write(json.dumps(row) + '\n')
+            count += 1
+            if count % AVAILABILITY_FEED_CHUNK_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @api.model
+    def _export_availability_feed(self, path, fmt='jsonl', since=None, published_only=False, website_id=None):
+        """Write the availability feed to a file, e.g. from ``odoo-bin shell``.
+
+        :return: the path written to
+        """
+        if isinstance(since, str):
+            since = fields.Datetime.to_datetime(since)
+        with open(path, 'w', encoding='utf-8', newline='') as feed_file:
+            for chunk in self._iter_availability_feed(fmt=fmt, since=since, published_only=published_only,
+                                                      website_id=website_id):
+                feed_file.write(chunk)
+        _logger.info(f"Availability feed exported to {path}")
+        return path
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timezone
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Number of archive cron runs kept for the metrics route
+CRON_RUN_HISTORY_SIZE = 1000
+
+
+class ProductSaleWindowCronRun(models.Model):
+    _name = 'product.sale.window.cron.run'
+    _description = 'Sale Window Cron Run'
+    _order = 'finished_at desc, id desc'
+    _log_access = False
+
+    finished_at = fields.Datetime(string='Finished At', required=True, readonly=True, index=True)
+    duration = fields.Float(string='Duration (s)', readonly=True)
+    archived_count = fields.Integer(string='Archived', readonly=True)
+    reactivated_count = fields.Integer(string='Reactivated', readonly=True)
+
+    @api.model
+    def _record_run(self, vals):
+        """Store the figures of an archive cron run and drop the oldest runs
+        beyond ``CRON_RUN_HISTORY_SIZE``.
+        """
+        cron_run = self.create(vals)
+        self.env.cr.execute(SQL(
+            """
+            DELETE FROM %(table)s
+             WHERE id IN (SELECT id FROM %(table)s
+                           ORDER BY finished_at DESC, id DESC
+                          OFFSET %(size)s)
+            """,
+            table=SQL.identifier(self._table),
+            size=CRON_RUN_HISTORY_SIZE,
+        ))
+        if self.env.cr.rowcount:
+            self.invalidate_model()
+        return cron_run
+
+    @api.model
+    def _get_last_run(self):
+        """Return the figures of the last archive cron run for the metrics route."""
+        last_run = self.search([], limit=1)
+        if not last_run:
+            return {}
+        return {
+            'finished_at': last_run.finished_at.replace(tzinfo=timezone.utc).timestamp(),
+            'duration': last_run.duration,
+            'archived': last_run.archived_count,
+            'reactivated': last_run.reactivated_count,
+        }
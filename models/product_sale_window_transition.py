@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL, split_every
+import logging
+
+_logger = logging.getLogger(__name__)
+
+TRANSITION_STATES = [
+    ('active', 'Active'),
+    ('archived', 'Archived'),
+]
+
+# Rows per multi-row INSERT statement
+INSERT_BATCH_SIZE = 1000
+
+
+class ProductSaleWindowTransition(models.Model):
+    _name = 'product.sale.window.transition'
+    _description = 'Sale Window Transition'
+    _order = 'timestamp desc, id desc'
+    _log_access = False
+
+    res_model = fields.Char(
+        string='Record Model',
+        required=True,
+        readonly=True,
+        help='Model of the archived or reactivated record.'
+    )
+    res_id = fields.Many2oneReference(
+        string='Record ID',
+        model_field='res_model',
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    old_state = fields.Selection(TRANSITION_STATES, string='Old State', required=True, readonly=True)
+    new_state = fields.Selection(TRANSITION_STATES, string='New State', required=True, readonly=True)
+    timestamp = fields.Datetime(
+        string='Timestamp',
+        required=True,
+        readonly=True,
+        index=True,
+        default=fields.Datetime.now,
+    )
+    cause = fields.Selection([
+        ('cron', 'Cron'),
+        ('write', 'Write'),
+        ('propagation', 'Propagation'),
+    ], string='Cause', required=True, readonly=True,
+        help='Cron: archive cron run. Write: direct change of the active flag. '
+             'Propagation: sale date change on an attribute value.')
+
+    def write(self, vals):
+        """Transitions are append-only."""
+        raise UserError(_('Sale window transitions cannot be modified.'))
+
+    @api.model
+    def _log_transitions(self, res_model, transitions, cause):
+        """Append transitions with multi-row inserts.
+
+        :param str res_model: model of the records that changed state
+        :param transitions: iterable of ``(res_id, old_active, new_active)``
+        :param str cause: one of the ``cause`` selection values
+        """
+        now = fields.Datetime.now()
+        count = 0
+        for batch in split_every(INSERT_BATCH_SIZE, transitions):
+            self.env.cr.execute(SQL(
+                "INSERT INTO %s (res_model, res_id, old_state, new_state, timestamp, cause) VALUES %s",
+                SQL.identifier(self._table),
+                SQL(', ').join(
+                    SQL('(%s, %s, %s, %s, %s, %s)',
+                        res_model, res_id,
+                        'active' if old_active else 'archived',
+                        'active' if new_active else 'archived',
+                        now, cause)
+                    for res_id, old_active, new_active in batch
+                ),
+            ))
+            count += len(batch)
+        return count
+
+    @api.model
+    def _cron_prune_transitions(self):
+        """Delete transitions older than the configured retention, in one statement."""
+        retention_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'product_variant_dates.transition_retention_days', 90))
+        cutoff = fields.Datetime.now() - timedelta(days=retention_days)
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE timestamp < %s",
+            SQL.identifier(self._table),
+            cutoff,
+        ))
+        pruned_count = self.env.cr.rowcount
+        self.invalidate_model()
+        _logger.info(f"Pruned {pruned_count} sale window transitions older than {retention_days} days")
+        return pruned_count
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 import logging
+import time
+
+from ..tools import metrics
+from ..tools.sale_period import format_sale_period_info, get_sale_window_tz
 
 _logger = logging.getLogger(__name__)
 
@@ -108,37 +113,28 @@ class ProductTemplate(models.Model):
                 template.website_published = False
 
     @api.depends('sale_start_date', 'sale_end_date')
+    @api.depends_context('website_id', 'tz', 'lang')
     def _compute_sale_period_info(self):
-        """Compute human readable sale period information."""
+        """Compute human readable sale period information, in the website or user timezone."""
+        tz_name = get_sale_window_tz(self.env)
         for template in self:
-            if template.sale_end_date:
-                # Format date as "1st Jul" style
-                day = template.sale_end_date.day
-                month = template.sale_end_date.strftime('%b')
-                if day in (1, 21, 31):
-                    suffix = 'st'
-                elif day in (2, 22):
-                    suffix = 'nd'
-                elif day in (3, 23):
-                    suffix = 'rd'
-                else:
-                    suffix = 'th'
-                template.sale_period_info = _('Until %d%s %s') % (day, suffix, month)
-            else:
-                template.sale_period_info = ''
+            # Format date as "1st Jul" style
+            template.sale_period_info = format_sale_period_info(self.env, template.sale_end_date, tz_name)
 
     @api.depends('sale_end_date', 'is_sale_period_active')
     def _compute_website_ribbon_id(self):
         """Compute ribbon based on sale period."""
         for template in self:
             if template.sale_end_date and template.is_sale_period_active:
-                # Create a unique ribbon name for this product template
-                product_ribbon_name = f"{template.sale_period_info}"
+                # Create a unique ribbon name for this product template, in the timezone of its website
+                website = template.website_id or template.env['website'].get_current_website()
+                product_ribbon_name = format_sale_period_info(self.env, template.sale_end_date, website._get_sale_window_tz())
 
                 # Create or get a ribbon for the product sale period
                 ribbon = template.env['product.ribbon'].search([
                     ('name', '=', product_ribbon_name)
                 ], limit=1)
+                metrics.record_ribbon_lookup('template', bool(ribbon))
 
                 if not ribbon:
                     # Create a new ribbon for this product sale period
@@ -156,6 +152,7 @@ class ProductTemplate(models.Model):
 
     def _get_combination_info(self, combination=None, product_id=None, add_qty=1, parent_combination=None, only_template=None):
         """Override to include sale period information in combination info."""
+        started_at = time.perf_counter()
         info = super()._get_combination_info(
             combination=combination,
             product_id=product_id,
@@ -171,14 +168,84 @@ class ProductTemplate(models.Model):
                 info['is_sale_period_active'] = variant.is_sale_period_active
                 info['sale_period_info'] = variant.sale_period_info
 
+        metrics.observe_combination_info(time.perf_counter() - started_at)
         return info
 
+    @api.model
+    def _get_sale_window_bus_channel(self, template_id):
+        """Bus channel on which the product page of a template listens for sale window transitions."""
+        return f'product_variant_dates.sale_window.{template_id}'
+
     @api.model
     def _cron_archive_inactive_variants(self):
         """Cron job to archive variants with inactive sale periods and reactivate those with active periods."""
         try:
-            # Use the dedicated method in product.product
+            started_at = time.monotonic()
+            # Use the dedicated method in product.product, which also moves
+            # attribute values whose window just started or ended to their new window
             result = self.env['product.product']._force_archive_inactive_variants()
             _logger.info(f"Cron job completed: {result['archived']} archived, {result['reactivated']} reactivated")
+            # Run again at the next cut-over rather than at the next hourly run
+            self.env['product.attribute.value'].with_context(active_test=False).search([
+                ('sale_next_transition', '>', fields.Datetime.now()),
+            ], order='sale_next_transition', limit=1)._trigger_sale_window_cron()
+            # Keep the figures of the last run for the metrics route, which is
+            # served by other worker processes than the cron
+            self.env['product.sale.window.cron.run'].sudo()._record_run({
+                'finished_at': fields.Datetime.now(),
+                'duration': time.monotonic() - started_at,
+                'archived_count': result['archived'],
+                'reactivated_count': result['reactivated'],
+            })
         except Exception as e:
             _logger.error(f"Error in _cron_archive_inactive_variants: {e}")
+
+    @api.model
+    def _get_sale_window_state_counts(self, model_name, now):
+        """Count the records of a model per sale-window state in one aggregate query."""
+        model = self.env[model_name]
+        model.flush_model(['sale_start_date', 'sale_end_date'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT count(*) FILTER (WHERE sale_start_date > %(now)s),
+                   count(*) FILTER (WHERE (sale_start_date IS NULL OR sale_start_date <= %(now)s)
+                                      AND sale_end_date < %(now)s),
+                   count(*)
+              FROM %(table)s
+            """,
+            now=now,
+            table=SQL.identifier(model._table),
+        ))
+        upcoming, expired, total = self.env.cr.fetchone()
+        return {
+            'active': total - upcoming - expired,
+            'expired': expired,
+            'upcoming': upcoming,
+        }
+
+    @api.model
+    def _get_sale_window_metrics(self):
+        """Collect the database figures exported by the metrics route.
+
+        Archived records are counted too, so that expired variants stay
+        visible after the cron has archived them.
+        """
+        now = fields.Datetime.now()
+        variant_table = self.env['product.product']._table
+        self.env.cr.execute(SQL(
+            """
+            SELECT LEAST(MIN(sale_start_date) FILTER (WHERE sale_start_date > %(now)s),
+                         MIN(sale_end_date) FILTER (WHERE sale_end_date > %(now)s))
+              FROM %(table)s
+            """,
+            now=now,
+            table=SQL.identifier(variant_table),
+        ))
+        next_boundary = self.env.cr.fetchone()[0]
+
+        return {
+            'variants': self._get_sale_window_state_counts('product.product', now),
+            'templates': self._get_sale_window_state_counts('product.template', now),
+            'next_boundary': next_boundary and next_boundary.replace(tzinfo=timezone.utc).timestamp(),
+            'last_cron_run': self.env['product.sale.window.cron.run'].sudo()._get_last_run(),
+        }
@@ -4,6 +4,8 @@ from datetime import datetime, date
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 
+from ..tools.sale_period import format_sale_period_info, get_sale_window_tz
+
 
 class ProductTemplateAttributeValue(models.Model):
     _inherit = 'product.template.attribute.value'
@@ -33,13 +35,13 @@ class ProductTemplateAttributeValue(models.Model):
         help='Human readable information about the sale period'
     )
 
-    @api.depends('product_attribute_value_id.sale_start_date', 'product_attribute_value_id.sale_end_date')
+    @api.depends('product_attribute_value_id.sale_window_start', 'product_attribute_value_id.sale_window_end')
     def _compute_sale_dates_from_attribute_value(self):
-        """Compute sale dates from the related product.attribute.value."""
+        """Compute sale dates from the window in effect on the related product.attribute.value."""
         for ptav in self:
             if ptav.product_attribute_value_id:
-                ptav.sale_start_date = ptav.product_attribute_value_id.sale_start_date
-                ptav.sale_end_date = ptav.product_attribute_value_id.sale_end_date
+                ptav.sale_start_date = ptav.product_attribute_value_id.sale_window_start
+                ptav.sale_end_date = ptav.product_attribute_value_id.sale_window_end
             else:
                 ptav.sale_start_date = False
                 ptav.sale_end_date = False
@@ -57,23 +59,12 @@ class ProductTemplateAttributeValue(models.Model):
                 ptav.is_sale_period_active = True
 
     @api.depends('sale_start_date', 'sale_end_date')
+    @api.depends_context('website_id', 'tz', 'lang')
     def _compute_sale_period_info(self):
-        """Compute human readable sale period information."""
+        """Compute human readable sale period information, in the website or user timezone."""
+        tz_name = get_sale_window_tz(self.env)
         for ptav in self:
-            if ptav.sale_end_date:
-                # Format date as "1st Jul" style
-                day = ptav.sale_end_date.day
-                month = ptav.sale_end_date.strftime('%b')
-                if day in (1, 21, 31):
-                    suffix = 'st'
-                elif day in (2, 22):
-                    suffix = 'nd'
-                elif day in (3, 23):
-                    suffix = 'rd'
-                else:
-                    suffix = 'th'
-                ptav.sale_period_info = _('Until %d%s %s') % (day, suffix, month)
-            else:
-                ptav.sale_period_info = ''
+            # Format date as "1st Jul" style
+            ptav.sale_period_info = format_sale_period_info(self.env, ptav.sale_end_date, tz_name)
 
 
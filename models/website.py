@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, models
+from odoo.addons.base.models.res_partner import _tz_get
+
+
+class Website(models.Model):
+    _inherit = 'website'
+
+    sale_window_tz = fields.Selection(
+        _tz_get,
+        string='Sale Window Timezone',
+        help='Timezone in which sale periods are shown on this website. Defaults to the timezone of the company.'
+    )
+
+    def _get_sale_window_tz(self):
+        """Return the timezone name used for the sale periods of this website."""
+        self.ensure_one()
+        return self.sale_window_tz or self.company_id.partner_id.tz or 'UTC'
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Concurrent load test for product-page combination and cart requests.
+
+Runs against a local Odoo instance with ``product_variant_dates`` and
+``website_sale`` installed. It generates (or reuses) a ticket catalog whose
+release tiers end during the run, then fires concurrent
+``/website_sale/get_combination_info`` and ``/shop/cart/update_json``
+requests from independent public sessions, optionally while the archive cron
+runs and while attribute value dates are being edited.
+
+Only the standard library is required. When ``--dsn`` is given and psycopg2
+is importable, PostgreSQL lock waits and deadlocks are sampled as well.
+
+Example::
+
+    python3 scripts/load_test_combination.py --url http://localhost:8069 \\
+        --db shop --login admin --password admin \\
+        --generate --tiers 3 --seats 50 --boundary-in 20 \\
+        --concurrency 32 --duration 60 --with-cron --with-edits \\
+        --dsn "dbname=shop"
+"""
+
+import argparse
+import http.cookiejar
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import xmlrpc.client
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+CRON_XMLID = ('product_variant_dates', 'cron_archive_inactive_variants')
+
+# Substrings of server errors, matched case-insensitively, used to classify failures
+SERIALIZATION_MARKERS = ('could not serialize access', 'serializationfailure', 'concurrent update')
+LOCK_MARKERS = ('lock timeout', 'locknotavailable', 'could not obtain lock', 'deadlock detected')
+
+
+def odoo_datetime(value):
+    """Format an aware or naive UTC datetime the way the Odoo ORM expects."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class OdooAdmin:
+    """Thin XML-RPC client used for catalog setup, cron runs and date edits."""
+
+    def __init__(self, url, db, login, password):
+        self.db = db
+        self.password = password
+        common = xmlrpc.client.ServerProxy('%s/xmlrpc/2/common' % url, allow_none=True)
+        self.uid = common.authenticate(db, login, password, {})
+        if not self.uid:
+            raise SystemExit('Authentication failed for %s on %s' % (login, db))
+        self.url = url
+
+    def call(self, model, method, *args, **kwargs):
+        # One proxy per call: ServerProxy is not thread-safe
+        proxy = xmlrpc.client.ServerProxy('%s/xmlrpc/2/object' % self.url, allow_none=True)
+        return proxy.execute_kw(self.db, self.uid, self.password, model, method, list(args), kwargs)
+
+    def xmlid_to_res_id(self, module, name):
+        rows = self.call('ir.model.data', 'search_read', [('module', '=', module), ('name', '=', name)], fields=['res_id'], limit=1)
+        return rows[0]['res_id'] if rows else None
+
+
+def generate_catalog(admin, tiers, seats, boundary_in):
+    """Create a published ticket template whose first release tier ends during the run.
+
+    Tier ``n`` is on sale until ``now + boundary_in * n`` and tier ``n + 1``
+    starts at that instant, so every boundary falls inside the run.
+    """
+    now = datetime.now(timezone.utc)
+    suffix = now.strftime('%Y%m%d%H%M%S')
+    release = admin.call('product.attribute', 'create', {'name': 'Load Test Release %s' % suffix, 'create_variant': 'always'})
+    tier_ids = []
+    for index in range(tiers):
+        start = now - timedelta(days=1) if index == 0 else now + timedelta(seconds=boundary_in * index)
+        end = now + timedelta(seconds=boundary_in * (index + 1)) if index < tiers - 1 else now + timedelta(days=30)
+        tier_ids.append(admin.call('product.attribute.value', 'create', {
+            'name': 'Tier %d' % (index + 1),
+            'attribute_id': release,
+            'sale_start_date': odoo_datetime(start),
+            'sale_end_date': odoo_datetime(end),
+        }))
+    seat = admin.call('product.attribute', 'create', {'name': 'Load Test Seat %s' % suffix, 'create_variant': 'always'})
+    seat_ids = [
+        admin.call('product.attribute.value', 'create', {'name': 'Seat %d' % (index + 1), 'attribute_id': seat})
+        for index in range(seats)
+    ]
+    template_id = admin.call('product.template', 'create', {
+        'name': 'Load Test Ticket %s' % suffix,
+        'type': 'consu',
+        'sale_ok': True,
+        'is_published': True,
+        'list_price': 100.0,
+        'attribute_line_ids': [
+            (0, 0, {'attribute_id': release, 'value_ids': [(6, 0, tier_ids)]}),
+            (0, 0, {'attribute_id': seat, 'value_ids': [(6, 0, seat_ids)]}),
+        ],
+    })
+    return template_id, tier_ids
+
+
+def load_combinations(admin, template_id):
+    """Return ``(product_id, [ptav ids])`` for every variant of the template, archived ones included."""
+    variants = admin.call(
+        'product.product', 'search_read', [('product_tmpl_id', '=', template_id)],
+        fields=['product_template_attribute_value_ids'], context={'active_test': False},
+    )
+    return [(variant['id'], variant['product_template_attribute_value_ids']) for variant in variants]
+
+
+class Recorder:
+    """Thread-safe collector of request outcomes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.background = defaultdict(list)
+
+    def record(self, operation, seconds, outcome):
+        with self.lock:
+            self.latencies[operation].append(seconds)
+            self.outcomes[operation][outcome] += 1
+
+    def record_background(self, operation, seconds, outcome):
+        with self.lock:
+            self.background[operation].append((seconds, outcome))
+
+
+def classify_error(text):
+    lowered = text.lower()
+    if any(marker in lowered for marker in SERIALIZATION_MARKERS):
+        return 'serialization_error'
+    if any(marker in lowered for marker in LOCK_MARKERS):
+        return 'lock_error'
+    return 'error'
+
+
+class ShopSession:
+    """One anonymous shopper with its own cookie jar (and therefore its own cart)."""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self.request_ids = itertools.count(1)
+
+    def json_rpc(self, path, params):
+        payload = json.dumps({'jsonrpc': '2.0', 'method': 'call', 'id': next(self.request_ids), 'params': params}).encode()
+        request = urllib.request.Request(self.url + path, data=payload, headers={'Content-Type': 'application/json'})
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                body = json.loads(response.read().decode() or '{}')
+        except urllib.error.HTTPError as error:
+            return classify_error(error.read().decode(errors='replace')) if error.code >= 500 else 'http_%d' % error.code
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            return 'connection_error'
+        if 'error' in body:
+            return classify_error(json.dumps(body['error']))
+        return 'ok'
+
+
+def shopper(args, combinations, template_id, recorder, deadline):
+    session = ShopSession(args.url, args.timeout)
+    while time.monotonic() < deadline:
+        product_id, ptav_ids = random.choice(combinations)
+        if random.random() < args.cart_ratio:
+            operation = 'cart_update'
+            path, params = '/shop/cart/update_json', {'product_id': product_id, 'add_qty': 1}
+        else:
+            operation = 'combination_info'
+            path, params = '/website_sale/get_combination_info', {
+                'product_template_id': template_id,
+                'product_id': product_id,
+                'combination': ptav_ids,
+                'add_qty': 1,
+                'parent_combination': [],
+            }
+        started_at = time.perf_counter()
+        outcome = session.json_rpc(path, params)
+        recorder.record(operation, time.perf_counter() - started_at, outcome)
+
+
+def run_periodically(operation, interval, deadline, recorder, action):
+    while time.monotonic() < deadline:
+        started_at = time.perf_counter()
+        try:
+            action()
+            outcome = 'ok'
+        except xmlrpc.client.Fault as fault:
+            outcome = classify_error(fault.faultString)
+        except (OSError, xmlrpc.client.ProtocolError):
+            outcome = 'connection_error'
+        recorder.record_background(operation, time.perf_counter() - started_at, outcome)
+        time.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+
+
+def sample_postgres(dsn, deadline, interval, result):
+    """Sample lock waits and collect the deadlock/conflict deltas of the database."""
+    try:
+        import psycopg2
+    except ImportError:
+        result['skipped'] = 'psycopg2 is not installed'
+        return
+    connection = psycopg2.connect(dsn)
+    connection.autocommit = True
+    stats_query = "SELECT deadlocks, conflicts FROM pg_stat_database WHERE datname = current_database()"
+    with connection.cursor() as cursor:
+        cursor.execute(stats_query)
+        start_deadlocks, start_conflicts = cursor.fetchone()
+        samples = []
+        while time.monotonic() < deadline:
+            cursor.execute("""
+                SELECT count(*) FROM pg_stat_activity
+                 WHERE datname = current_database() AND wait_event_type = 'Lock'
+            """)
+            samples.append(cursor.fetchone()[0])
+            time.sleep(interval)
+        cursor.execute(stats_query)
+        end_deadlocks, end_conflicts = cursor.fetchone()
+    connection.close()
+    result.update({
+        'lock_wait_samples': len(samples),
+        'lock_waiting_max': max(samples, default=0),
+        'lock_waiting_avg': sum(samples) / len(samples) if samples else 0.0,
+        'deadlocks': end_deadlocks - start_deadlocks,
+        'conflicts': end_conflicts - start_conflicts,
+    })
+
+
+def summarize(recorder, elapsed, postgres):
+    report = {'elapsed_seconds': round(elapsed, 3), 'operations': {}, 'background': {}, 'postgres': postgres}
+    for operation, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        outcomes = recorder.outcomes[operation]
+        report['operations'][operation] = {
+            'requests': len(latencies),
+            'throughput_per_second': round(len(latencies) / elapsed, 2) if elapsed else None,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+            'outcomes': dict(outcomes),
+        }
+    for operation, runs in sorted(recorder.background.items()):
+        durations = sorted(seconds for seconds, _outcome in runs)
+        report['background'][operation] = {
+            'runs': len(runs),
+            'max_seconds': round(durations[-1], 3) if durations else None,
+            'outcomes': dict(Counter(outcome for _seconds, outcome in runs)),
+        }
+    totals = Counter()
+    for outcomes in recorder.outcomes.values():
+        totals.update(outcomes)
+    for runs in recorder.background.values():
+        totals.update(outcome for _seconds, outcome in runs)
+    report['serialization_errors'] = totals['serialization_error']
+    report['lock_errors'] = totals['lock_error']
+    return report
+
+
+def print_report(report):
+    print('Elapsed: %.1fs' % report['elapsed_seconds'])
+    for operation, stats in report['operations'].items():
+        print('%-17s %7d req  %8.1f req/s  p50 %8.1fms  p95 %8.1fms  p99 %8.1fms  %s' % (
+            operation, stats['requests'], stats['throughput_per_second'] or 0.0,
+            stats['p50_ms'], stats['p95_ms'], stats['p99_ms'], stats['outcomes'],
+        ))
+    for operation, stats in report['background'].items():
+        print('%-17s %7d runs  max %.2fs  %s' % (operation, stats['runs'], stats['max_seconds'] or 0.0, stats['outcomes']))
+    print('Serialization errors: %d  Lock errors: %d' % (report['serialization_errors'], report['lock_errors']))
+    if report['postgres']:
+        print('PostgreSQL: %s' % report['postgres'])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://localhost:8069')
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--login', default='admin')
+    parser.add_argument('--password', default='admin')
+    catalog = parser.add_mutually_exclusive_group(required=True)
+    catalog.add_argument('--template-id', type=int, help='Existing published product.template to hit')
+    catalog.add_argument('--generate', action='store_true', help='Generate a ticket catalog for this run')
+    parser.add_argument('--tiers', type=int, default=3, help='Release tiers of the generated catalog')
+    parser.add_argument('--seats', type=int, default=20, help='Seat values of the generated catalog')
+    parser.add_argument('--boundary-in', type=float, default=15.0, help='Seconds between generated tier boundaries')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+    parser.add_argument('--cart-ratio', type=float, default=0.2, help='Share of requests that add to cart')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+    parser.add_argument('--with-cron', action='store_true', help='Run the archive cron during the test')
+    parser.add_argument('--cron-interval', type=float, default=5.0)
+    parser.add_argument('--with-edits', action='store_true', help='Edit attribute value dates during the test')
+    parser.add_argument('--edit-interval', type=float, default=2.0)
+    parser.add_argument('--dsn', help='libpq DSN used to sample lock waits (needs psycopg2)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    admin = OdooAdmin(args.url, args.db, args.login, args.password)
+    if args.generate:
+        template_id, value_ids = generate_catalog(admin, args.tiers, args.seats, args.boundary_in)
+    else:
+        template_id = args.template_id
+        value_ids = admin.call('product.template.attribute.value', 'search_read', [('product_tmpl_id', '=', template_id)], fields=['product_attribute_value_id'])
+        value_ids = sorted({row['product_attribute_value_id'][0] for row in value_ids})
+    combinations = load_combinations(admin, template_id)
+    if not combinations:
+        raise SystemExit('Template %s has no variants' % template_id)
+
+    recorder = Recorder()
+    postgres = {}
+    started_at = time.monotonic()
+    deadline = started_at + args.duration
+    threads = [
+        threading.Thread(target=shopper, args=(args, combinations, template_id, recorder, deadline), daemon=True)
+        for _index in range(args.concurrency)
+    ]
+    if args.with_cron:
+        cron_id = admin.xmlid_to_res_id(*CRON_XMLID)
+        if not cron_id:
+            raise SystemExit('Cron %s.%s not found' % CRON_XMLID)
+        threads.append(threading.Thread(target=run_periodically, daemon=True, args=(
+            'archive_cron', args.cron_interval, deadline, recorder,
+            lambda: admin.call('ir.cron', 'method_direct_trigger', [cron_id]),
+        )))
+    if args.with_edits:
+        def shift_dates():
+            # Nudge the end date of a random value by a second back and forth so windows stay put overall
+            value = admin.call('product.attribute.value', 'read', [random.choice(value_ids)], fields=['sale_end_date'])[0]
+            if value['sale_end_date']:
+                end = datetime.strptime(value['sale_end_date'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+                admin.call('product.attribute.value', 'write', [value['id']], {
+                    'sale_end_date': odoo_datetime(end + timedelta(seconds=random.choice((-1, 1)))),
+                })
+        threads.append(threading.Thread(target=run_periodically, daemon=True, args=(
+            'date_edit', args.edit_interval, deadline, recorder, shift_dates,
+        )))
+    if args.dsn:
+        threads.append(threading.Thread(target=sample_postgres, args=(args.dsn, deadline, 0.1, postgres), daemon=True))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = summarize(recorder, time.monotonic() - started_at, postgres)
+    report['template_id'] = template_id
+    report['variants'] = len(combinations)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print('Template %s with %d variants' % (template_id, len(combinations)))
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
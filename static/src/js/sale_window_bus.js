@@ -0,0 +1,236 @@
+/** @odoo-module **/
+
+import publicWidget from "@web/legacy/js/public/public_widget";
+import "@website_sale/js/website_sale";
+
+// Marks set by this widget, so they can be told apart from the exclusions
+// computed by website_sale
+const ARCHIVED_MARK = "o_sale_window_archived";
+// Dispatched on the product element once website_sale has refreshed the
+// availability of the options and of the selected combination
+const EXCLUSIONS_CHECKED_EVENT = "product_variant_dates:exclusions_checked";
+
+/**
+ * @param {HTMLElement|jQuery} parent element or jQuery wrapper used by VariantMixin
+ */
+function notifyExclusionsChecked(parent) {
+    const parentEl = parent && (parent instanceof HTMLElement ? parent : parent[0]);
+    if (parentEl) {
+        parentEl.dispatchEvent(new CustomEvent(EXCLUSIONS_CHECKED_EVENT, { bubbles: true }));
+    }
+}
+
+// website_sale resets `css_not_available` on the options when it computes the
+// exclusions, and the add to cart button when it applies the combination info,
+// both after the combination info RPC: let the sale window widget mark the
+// archived combinations again once each is done
+publicWidget.registry.WebsiteSale.include({
+    /**
+     * @override
+     */
+    _checkExclusions(parent) {
+        const result = this._super(...arguments);
+        notifyExclusionsChecked(parent);
+        return result;
+    },
+
+    /**
+     * @override
+     */
+    _onChangeCombination(ev, parent) {
+        const result = this._super(...arguments);
+        notifyExclusionsChecked(parent);
+        return result;
+    },
+});
+
+/**
+ * Keeps the variant availability of an open product page in sync with the
+ * sale window transitions published by the server, so buyers do not keep
+ * seeing a variant as buyable after its sale end date.
+ */
+publicWidget.registry.ProductVariantDatesSaleWindow = publicWidget.Widget.extend({
+    selector: "#product_detail",
+    events: {
+        [EXCLUSIONS_CHECKED_EVENT]: "_onExclusionsChecked",
+    },
+
+    init() {
+        this._super(...arguments);
+        this.busService = this.bindService("bus_service");
+        this._onSaleWindowTransition = this._onSaleWindowTransition.bind(this);
+        // Sorted attribute value ids of the variants archived since the page was loaded
+        this.archivedCombinations = new Map();
+    },
+
+    start() {
+        const templateInput = this.el.querySelector("input.product_template_id");
+        this.templateId = templateInput && parseInt(templateInput.value);
+        if (this.templateId) {
+            this.channel = `product_variant_dates.sale_window.${this.templateId}`;
+            this.busService.addChannel(this.channel);
+            this.busService.subscribe("product_variant_dates/sale_window", this._onSaleWindowTransition);
+        }
+        return this._super(...arguments);
+    },
+
+    destroy() {
+        if (this.channel) {
+            this.busService.unsubscribe("product_variant_dates/sale_window", this._onSaleWindowTransition);
+            this.busService.deleteChannel(this.channel);
+        }
+        this._super(...arguments);
+    },
+
+    //--------------------------------------------------------------------------
+    // Private
+    //--------------------------------------------------------------------------
+
+    /**
+     * @private
+     * @param {number[]} combination attribute value ids
+     * @returns {string}
+     */
+    _getCombinationKey(combination) {
+        return [...combination].sort((a, b) => a - b).join(",");
+    },
+
+    /**
+     * Return the value id selected by a variant input, or 0 if none.
+     *
+     * @private
+     * @param {HTMLElement} attributeEl
+     * @returns {number}
+     */
+    _getSelectedValueId(attributeEl) {
+        const input = attributeEl.querySelector(
+            "input.js_variant_change:checked, select.js_variant_change"
+        );
+        return (input && parseInt(input.value)) || 0;
+    },
+
+    /**
+     * Whether the given values contain the combination of an archived
+     * variant. Values of attributes that create no variant are not part of
+     * the combinations, hence the inclusion test.
+     *
+     * @private
+     * @param {Set<number>} valueIds
+     * @returns {boolean}
+     */
+    _isArchived(valueIds) {
+        return [...this.archivedCombinations.values()].some((combination) =>
+            combination.every((valueId) => valueIds.has(valueId))
+        );
+    },
+
+    /**
+     * Mark every option that, with the other selected values, leads to an
+     * archived variant, and the selected combination itself when it is archived.
+     *
+     * Marks are reconciled with the current page: marks website_sale has
+     * cleared in the meantime are set again, marks no longer needed are
+     * removed, and classes website_sale set on its own are left alone.
+     *
+     * @private
+     */
+    _markArchivedCombinations() {
+        // Element -> unavailability class it should get from this widget
+        const wanted = new Map();
+        const attributeEls = [...this.el.querySelectorAll("li.variant_attribute")];
+        const selectedValueIds = attributeEls.map((attributeEl) => this._getSelectedValueId(attributeEl));
+        if (this.archivedCombinations.size) {
+            attributeEls.forEach((attributeEl, index) => {
+                const otherValueIds = selectedValueIds.filter((valueId, i) => i !== index && valueId);
+                const options = attributeEl.querySelectorAll("input.js_variant_change, select.js_variant_change option");
+                for (const option of options) {
+                    const valueId = parseInt(option.value);
+                    if (valueId && this._isArchived(new Set([...otherValueIds, valueId]))) {
+                        for (const el of [option, option.closest("label"), option.closest(".o_variant_pills")]) {
+                            if (el) {
+                                wanted.set(el, "css_not_available");
+                            }
+                        }
+                    }
+                }
+            });
+            if (this._isArchived(new Set(selectedValueIds.filter(Boolean)))) {
+                const productInput = this.el.querySelector("input.product_id");
+                const productEl = (productInput && productInput.closest(".js_product")) || this.el;
+                wanted.set(productEl, "css_not_available");
+                const addToCart = productEl.querySelector("#add_to_cart");
+                if (addToCart) {
+                    wanted.set(addToCart, "disabled");
+                }
+            }
+        }
+        for (const markedEl of this.el.querySelectorAll(`.${ARCHIVED_MARK}`)) {
+            const className = markedEl.dataset.saleWindowMark;
+            if (wanted.get(markedEl) === className && markedEl.classList.contains(className)) {
+                wanted.delete(markedEl);
+                continue;
+            }
+            markedEl.classList.remove(ARCHIVED_MARK);
+            delete markedEl.dataset.saleWindowMark;
+            if (!wanted.has(markedEl)) {
+                markedEl.classList.remove(className);
+            }
+        }
+        for (const [el, className] of wanted) {
+            // Leave the classes website_sale set for its own exclusions
+            if (!el.classList.contains(className)) {
+                el.classList.add(ARCHIVED_MARK, className);
+                el.dataset.saleWindowMark = className;
+            }
+        }
+    },
+
+    //--------------------------------------------------------------------------
+    // Handlers
+    //--------------------------------------------------------------------------
+
+    /**
+     * website_sale has recomputed the availability of the options: mark the
+     * archived combinations again on top of it.
+     *
+     * @private
+     */
+    _onExclusionsChecked() {
+        this._markArchivedCombinations();
+    },
+
+    /**
+     * Mark the options leading to archived variants as unavailable, and the
+     * selected variant too as soon as it is archived. When the selected
+     * variant is reactivated, re-run the variant change once so that prices and
+     * availability come back from the regular combination info.
+     *
+     * @private
+     * @param {Object} payload
+     */
+    _onSaleWindowTransition(payload) {
+        if (payload.template_id !== this.templateId) {
+            return;
+        }
+        for (const combination of payload.archived_combinations || []) {
+            this.archivedCombinations.set(this._getCombinationKey(combination), combination);
+        }
+        for (const combination of payload.reactivated_combinations || []) {
+            this.archivedCombinations.delete(this._getCombinationKey(combination));
+        }
+        this._markArchivedCombinations();
+
+        const productInput = this.el.querySelector("input.product_id");
+        const productId = productInput && parseInt(productInput.value);
+        if (productId && payload.reactivated_product_ids.includes(productId)) {
+            const variantInput = this.el.querySelector(
+                "input.js_variant_change:checked, select.js_variant_change"
+            );
+            if (variantInput) {
+                variantInput.dispatchEvent(new Event("change", { bubbles: true }));
+            }
+        }
+    },
+});
+
+export default publicWidget.registry.ProductVariantDatesSaleWindow;
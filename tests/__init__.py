@@ -1,3 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from . import test_product_variant_dates
+from . import test_sale_window_metrics
+from . import test_archive_dry_run
+from . import test_sale_window_transition
+from . import test_sale_window_bus
+from . import test_availability_feed
+from . import test_sale_windows
+from . import test_sale_window_tz
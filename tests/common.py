@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class SaleWindowTestCase(TransactionCase):
+    """Base test case building ticket products with dated attribute values."""
+
+    def setUp(self):
+        super().setUp()
+        self.now = fields.Datetime.now().replace(microsecond=0)
+
+    def _create_ticket(self, name, windows):
+        """Create a ticket template with one release value per sale window.
+
+        :param str name: name of the template; also used to name its attribute
+        :param dict windows: value name -> ``(sale_start_date, sale_end_date)``,
+                             either date may be False
+        :return: the template, the values by name and the variants by value name
+        """
+        attribute = self.env['product.attribute'].create({
+            'name': '%s Release' % name,
+            'create_variant': 'always',
+        })
+        values = {
+            value_name: self.env['product.attribute.value'].create({
+                'name': value_name,
+                'attribute_id': attribute.id,
+                'sale_start_date': start,
+                'sale_end_date': end,
+            })
+            for value_name, (start, end) in windows.items()
+        }
+        template = self.env['product.template'].create({
+            'name': name,
+            'type': 'consu',
+            'sale_ok': True,
+        })
+        self.env['product.template.attribute.line'].create({
+            'product_tmpl_id': template.id,
+            'attribute_id': attribute.id,
+            'value_ids': [(6, 0, [value.id for value in values.values()])],
+        })
+        all_variants = template.with_context(active_test=False).product_variant_ids
+        variants = {
+            value_name: all_variants.filtered(
+                lambda variant, value=value: value in variant.product_template_attribute_value_ids.product_attribute_value_id
+            )
+            for value_name, value in values.items()
+        }
+        return template, values, variants
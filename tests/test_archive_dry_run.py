@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest.mock import patch
+from odoo import fields
+
+from .common import SaleWindowTestCase
+
+
+class TestArchiveDryRun(SaleWindowTestCase):
+    """Test cases for the dry run of the archive pass."""
+
+    def setUp(self):
+        super().setUp()
+        _template, _values, variants = self._create_ticket('Dry Run Ticket', {
+            'Current': (self.now - timedelta(days=1), self.now + timedelta(days=1)),
+            'Upcoming': (self.now + timedelta(days=2), self.now + timedelta(days=3)),
+            'Open': (False, False),
+        })
+        self.current_variant = variants['Current']
+        self.upcoming_variant = variants['Upcoming']
+        self.open_variant = variants['Open']
+        # Start from a state where the current variant was archived by the cron
+        # and the upcoming one is still active
+        self.current_variant.with_context(skip_archiving=True).write({'active': False, 'sale_window_archived': True})
+        self.upcoming_variant.with_context(skip_archiving=True).write({'active': True})
+
+    def test_dry_run_does_not_write(self):
+        """Test that the dry run plans the transitions without applying them."""
+        result = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+        self.assertIn(self.upcoming_variant.id, result['archive_ids'])
+        self.assertIn(self.current_variant.id, result['reactivate_ids'])
+        self.assertEqual(result['archived'], len(result['archive_ids']))
+        self.assertEqual(result['reactivated'], len(result['reactivate_ids']))
+        self.assertIn(self.upcoming_variant.display_name, result['sample']['archive'])
+        self.assertTrue(self.upcoming_variant.active)
+        self.assertFalse(self.current_variant.active)
+
+    def test_dry_run_matches_archive_pass(self):
+        """Test that the archive pass applies exactly the planned transitions."""
+        planned = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+        result = self.env['product.product']._force_archive_inactive_variants()
+        self.assertEqual(result['archived'], planned['archived'])
+        self.assertEqual(result['reactivated'], planned['reactivated'])
+        self.assertFalse(self.upcoming_variant.active)
+        self.assertTrue(self.current_variant.active)
+        follow_up = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+        self.assertNotIn(self.upcoming_variant.id, follow_up['archive_ids'])
+        self.assertNotIn(self.current_variant.id, follow_up['reactivate_ids'])
+
+    def test_manually_archived_variant_stays_archived(self):
+        """Test that the archive pass does not reactivate variants archived by hand."""
+        self.open_variant.write({'active': False})
+        self.current_variant.write({'active': True})
+        self.current_variant.write({'active': False})
+        planned = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+        self.assertNotIn(self.open_variant.id, planned['reactivate_ids'])
+        self.assertNotIn(self.current_variant.id, planned['reactivate_ids'])
+        self.env['product.product']._force_archive_inactive_variants()
+        self.assertFalse(self.open_variant.active)
+        self.assertFalse(self.current_variant.active)
+
+    def test_archived_template_variants_stay_archived(self):
+        """Test that variants of an archived template are not reactivated."""
+        self.current_variant.product_tmpl_id.active = False
+        planned = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+        self.assertNotIn(self.current_variant.id, planned['reactivate_ids'])
+
+    def test_reactivation_survives_transition_pruning(self):
+        """Test that a variant archived long before its window opens is still reactivated."""
+        Variant = self.env['product.product']
+        Variant._force_archive_inactive_variants()
+        self.assertFalse(self.upcoming_variant.active)
+        self.assertTrue(self.upcoming_variant.sale_window_archived)
+        # The archiving falls out of the transition log retention
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE product_sale_window_transition SET timestamp = timestamp - interval '100 days' WHERE res_id = %s",
+            (self.upcoming_variant.id,),
+        )
+        self.env['ir.config_parameter'].sudo().set_param('product_variant_dates.transition_retention_days', 90)
+        self.env['product.sale.window.transition']._cron_prune_transitions()
+        self.assertFalse(self.env['product.sale.window.transition'].search([
+            ('res_model', '=', 'product.product'),
+            ('res_id', '=', self.upcoming_variant.id),
+        ]))
+        with patch.object(fields.Datetime, 'now', return_value=self.now + timedelta(days=2, hours=1)):
+            Variant._force_archive_inactive_variants()
+        self.assertTrue(self.upcoming_variant.active)
+        self.assertFalse(self.upcoming_variant.sale_window_archived)
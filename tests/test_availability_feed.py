@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+from datetime import timedelta
+from odoo import fields
+from odoo.tests import HttpCase, tagged
+
+from .common import SaleWindowTestCase
+
+
+class TestAvailabilityFeed(SaleWindowTestCase):
+    """Test cases for the streamed availability feed."""
+
+    def setUp(self):
+        super().setUp()
+        _template, _values, variants = self._create_ticket('Feed Ticket', {
+            'Current': (self.now - timedelta(days=1), self.now + timedelta(days=1)),
+        })
+        self.variant = variants['Current']
+
+    def _feed_rows(self, **kwargs):
+        lines = ''.join(self.env['product.product']._iter_availability_feed(**kwargs)).splitlines()
+        return {row['product_id']: row for row in map(json.loads, lines)}
+
+    def test_jsonl_feed(self):
+        """Test that the JSON lines feed contains the variant sale window."""
+        row = self._feed_rows()[self.variant.id]
+        self.assertEqual(row['name'], 'Feed Ticket')
+        self.assertTrue(row['active'])
+        self.assertTrue(row['sale_end_date'].startswith(self.variant.sale_end_date.strftime('%Y-%m-%dT%H:%M:%S')))
+        self.assertEqual(row['sale_period_info'], self.variant.sale_period_info)
+
+    def test_incremental_feed(self):
+        """Test that an incremental feed skips variants unchanged since the given time."""
+        self.env.flush_all()
+        self.assertNotIn(self.variant.id, self._feed_rows(since=fields.Datetime.now() + timedelta(hours=1)))
+
+    def test_incremental_feed_includes_recent_changes(self):
+        """Test that an incremental feed keeps variants written after the given time only."""
+        _template, _values, variants = self._create_ticket('Old Feed Ticket', {
+            'Current': (self.now - timedelta(days=1), self.now + timedelta(days=1)),
+        })
+        old_variant = variants['Current']
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE product_product SET write_date = %s WHERE id = %s",
+            (self.now - timedelta(days=2), old_variant.id),
+        )
+        self.env.cr.execute(
+            "UPDATE product_template SET write_date = %s WHERE id = %s",
+            (self.now - timedelta(days=2), old_variant.product_tmpl_id.id),
+        )
+        self.env.invalidate_all()
+        rows = self._feed_rows(since=self.now - timedelta(days=1))
+        self.assertIn(self.variant.id, rows)
+        self.assertNotIn(old_variant.id, rows)
+
+    def test_website_feed(self):
+        """Test that a website feed leaves out products bound to other websites."""
+        website = self.env['website'].create({'name': 'Feed Shop'})
+        other_website = self.env['website'].create({'name': 'Other Feed Shop'})
+        self.variant.product_tmpl_id.website_id = other_website
+        self.assertNotIn(self.variant.id, self._feed_rows(website_id=website.id))
+        self.assertIn(self.variant.id, self._feed_rows(website_id=other_website.id))
+        self.variant.product_tmpl_id.website_id = False
+        self.assertIn(self.variant.id, self._feed_rows(website_id=website.id))
+
+    def test_small_chunks(self):
+        """Test that rows spanning several database chunks are all read."""
+        rows = list(self.env['product.product']._iter_availability_feed_rows(chunk_size=1))
+        self.assertIn(self.variant.id, [row['product_id'] for row in rows])
+        self.assertEqual(len(rows), len({row['product_id'] for row in rows}))
+
+    def test_csv_export_to_file(self):
+        """Test that the CSV feed is written to a file with a header."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'feed.csv')
+            self.env['product.product']._export_availability_feed(path, fmt='csv')
+            with open(path, encoding='utf-8') as feed_file:
+                header = feed_file.readline().strip()
+                content = feed_file.read()
+        self.assertTrue(header.startswith('product_id,product_tmpl_id'))
+        self.assertIn('Feed Ticket', content)
+
+
+@tagged('post_install', '-at_install')
+class TestAvailabilityFeedRoute(HttpCase):
+    """Test cases for the availability feed route."""
+
+    def setUp(self):
+        super().setUp()
+        self.template = self.env['product.template'].create({
+            'name': 'Route Feed Ticket',
+            'type': 'consu',
+            'sale_ok': True,
+            'is_published': True,
+        })
+
+    def test_token_required(self):
+        """Test that the route is hidden until the right token is given."""
+        self.assertEqual(self.url_open('/product_variant_dates/feed.jsonl').status_code, 404)
+        self.env['ir.config_parameter'].sudo().set_param('product_variant_dates.feed_token', 'feed-secret')
+        self.assertEqual(self.url_open('/product_variant_dates/feed.jsonl').status_code, 404)
+        self.assertEqual(self.url_open('/product_variant_dates/feed.jsonl?token=wrong').status_code, 404)
+
+    def test_invalid_parameters(self):
+        """Test that unknown formats and malformed dates are rejected."""
+        self.env['ir.config_parameter'].sudo().set_param('product_variant_dates.feed_token', 'feed-secret')
+        self.assertEqual(self.url_open('/product_variant_dates/feed.xml?token=feed-secret').status_code, 404)
+        response = self.url_open('/product_variant_dates/feed.jsonl?token=feed-secret&since=yesterday')
+        self.assertEqual(response.status_code, 400)
+
+    def test_streamed_feed(self):
+        """Test that the feed is streamed with the published products."""
+        self.env['ir.config_parameter'].sudo().set_param('product_variant_dates.feed_token', 'feed-secret')
+        response = self.url_open('/product_variant_dates/feed.jsonl?token=feed-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['Content-Type'].startswith('application/x-ndjson'))
+        rows = {row['product_id']: row for row in map(json.loads, response.text.splitlines())}
+        self.assertEqual(rows[self.template.product_variant_id.id]['name'], 'Route Feed Ticket')
+
+        self.template.is_published = False
+        response = self.url_open('/product_variant_dates/feed.csv', headers={'Authorization': 'Bearer feed-secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.text.startswith('product_id,product_tmpl_id'))
+        self.assertNotIn('Route Feed Ticket', response.text)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest.mock import patch
+from odoo import fields
+
+from .common import SaleWindowTestCase
+
+
+class TestSaleWindowBus(SaleWindowTestCase):
+    """Test cases for the bus notifications of sale window transitions."""
+
+    def setUp(self):
+        super().setUp()
+        window = (self.now - timedelta(days=1), self.now + timedelta(days=1))
+        self.template, _values, variants = self._create_ticket('Bus Ticket', {
+            'First': window,
+            'Second': window,
+        })
+        self.variants = variants['First'] | variants['Second']
+
+    def test_one_message_per_template(self):
+        """Test that the transitions of a template are sent as a single message."""
+        first, second = self.variants
+        with patch.object(type(self.env['bus.bus']), '_sendone') as sendone:
+            self.env['product.product']._notify_sale_window_transitions([
+                (first.id, True, False),
+                (second.id, False, True),
+            ])
+        sendone.assert_called_once()
+        channel, notification_type, payload = sendone.call_args.args
+        self.assertEqual(channel, self.env['product.template']._get_sale_window_bus_channel(self.template.id))
+        self.assertEqual(notification_type, 'product_variant_dates/sale_window')
+        self.assertEqual(payload['archived_product_ids'], [first.id])
+        self.assertEqual(payload['reactivated_product_ids'], [second.id])
+        self.assertEqual(payload['archived_combinations'], [first.product_template_attribute_value_ids.ids])
+        self.assertEqual(payload['reactivated_combinations'], [second.product_template_attribute_value_ids.ids])
+
+    def test_archive_pass_notifies(self):
+        """Test that the archive pass publishes the variants it archives."""
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE product_product SET sale_end_date = %s WHERE id IN %s",
+            (fields.Datetime.now() - timedelta(hours=1), tuple(self.variants.ids)),
+        )
+        self.variants.invalidate_recordset()
+        with patch.object(type(self.env['bus.bus']), '_sendone') as sendone:
+            self.env['product.product']._force_archive_inactive_variants()
+        sendone.assert_called_once()
+        self.assertEqual(sorted(sendone.call_args.args[2]['archived_product_ids']), sorted(self.variants.ids))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta, timezone
+from unittest.mock import patch
+from odoo import fields
+from odoo.tests import HttpCase, tagged
+
+from odoo.addons.product_variant_dates.models import product_sale_window_cron_run as cron_run_module
+from odoo.addons.product_variant_dates.tools import metrics
+from .common import SaleWindowTestCase
+
+
+class TestSaleWindowMetrics(SaleWindowTestCase):
+    """Test cases for the sale-window metrics export."""
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+        self.template, values, _variants = self._create_ticket('Metrics Ticket', {
+            'Current': (self.now - timedelta(days=1), self.now + timedelta(days=1)),
+            'Upcoming': (self.now + timedelta(days=2), self.now + timedelta(days=3)),
+        })
+        self.current_value = values['Current']
+        self.upcoming_value = values['Upcoming']
+
+    def test_state_counts(self):
+        """Test that variants are counted per sale-window state."""
+        before = self.env['product.template']._get_sale_window_state_counts('product.product', fields.Datetime.now())
+        self.upcoming_value.sale_start_date = fields.Datetime.now() - timedelta(days=5)
+        self.upcoming_value.sale_end_date = fields.Datetime.now() - timedelta(days=4)
+        after = self.env['product.template']._get_sale_window_state_counts('product.product', fields.Datetime.now())
+        self.assertEqual(after['upcoming'], before['upcoming'] - 1)
+        self.assertEqual(after['expired'], before['expired'] + 1)
+
+    def test_next_boundary(self):
+        """Test that the next boundary is the closest future start or end date."""
+        result = self.env['product.template']._get_sale_window_metrics()
+        expected = self.current_value.sale_end_date
+        self.assertLessEqual(result['next_boundary'], expected.replace(tzinfo=timezone.utc).timestamp())
+
+    def test_last_cron_run(self):
+        """Test that the figures of the last archive cron run are exported."""
+        self.env['product.template']._cron_archive_inactive_variants()
+        last_run = self.env['product.template']._get_sale_window_metrics()['last_cron_run']
+        self.assertGreaterEqual(last_run['duration'], 0.0)
+        self.assertIn('archived', last_run)
+
+    def test_cron_run_history_is_bounded(self):
+        """Test that only the latest archive cron runs are kept."""
+        CronRun = self.env['product.sale.window.cron.run']
+        with patch.object(cron_run_module, 'CRON_RUN_HISTORY_SIZE', 2):
+            for hours in (3, 2, 1):
+                CronRun._record_run({'finished_at': self.now - timedelta(hours=hours), 'duration': hours})
+        self.assertEqual(CronRun.search([]).mapped('duration'), [1.0, 2.0])
+        self.assertEqual(CronRun._get_last_run()['duration'], 1.0)
+
+    def test_render_prometheus(self):
+        """Test that the exposition text contains the collected figures."""
+        metrics.observe_combination_info(0.02)
+        metrics.record_ribbon_lookup('variant', True)
+        text = metrics.render_prometheus(self.env['product.template']._get_sale_window_metrics())
+        self.assertIn('product_variant_dates_variants{state="active"}', text)
+        self.assertIn('product_variant_dates_combination_info_seconds_bucket{le="0.025",worker="', text)
+        self.assertIn('product_variant_dates_combination_info_seconds_count{worker="', text)
+        self.assertIn('product_variant_dates_ribbon_lookups_total{kind="variant",result="hit",worker="', text)
+
+
+@tagged('post_install', '-at_install')
+class TestSaleWindowMetricsRoute(HttpCase):
+    """Test cases for the token check of the metrics route."""
+
+    def test_token_required(self):
+        """Test that the route is hidden until the right token is given."""
+        self.assertEqual(self.url_open('/product_variant_dates/metrics').status_code, 404)
+        self.env['ir.config_parameter'].sudo().set_param('product_variant_dates.metrics_token', 'scrape-secret')
+        self.assertEqual(self.url_open('/product_variant_dates/metrics').status_code, 404)
+        self.assertEqual(self.url_open('/product_variant_dates/metrics?token=wrong').status_code, 404)
+        response = self.url_open('/product_variant_dates/metrics?token=scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('product_variant_dates_variants', response.text)
+        response = self.url_open('/product_variant_dates/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from odoo import fields
+from odoo.exceptions import UserError
+
+from .common import SaleWindowTestCase
+
+
+class TestSaleWindowTransition(SaleWindowTestCase):
+    """Test cases for the sale window transition log."""
+
+    def setUp(self):
+        super().setUp()
+        self.Transition = self.env['product.sale.window.transition']
+        _template, _values, variants = self._create_ticket('Transition Ticket', {
+            'Current': (self.now - timedelta(days=1), self.now + timedelta(days=1)),
+        })
+        self.variant = variants['Current']
+
+    def _transitions(self, cause):
+        return self.Transition.search([
+            ('res_model', '=', 'product.product'),
+            ('res_id', '=', self.variant.id),
+            ('cause', '=', cause),
+        ])
+
+    def test_log_transitions_bulk_insert(self):
+        """Test that transitions are inserted in bulk with their states."""
+        count = self.Transition._log_transitions('product.product', [
+            (self.variant.id, True, False),
+            (self.variant.id, False, True),
+        ], 'cron')
+        self.assertEqual(count, 2)
+        transitions = self._transitions('cron')
+        self.assertEqual(sorted(transitions.mapped('new_state')), ['active', 'archived'])
+
+    def test_cron_logs_transitions(self):
+        """Test that the archive pass logs the variants it archives."""
+        # Let the window lapse without going through the propagation path
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE product_product SET sale_end_date = %s WHERE id = %s",
+            (fields.Datetime.now() - timedelta(hours=1), self.variant.id),
+        )
+        self.variant.invalidate_recordset()
+        self.env['product.product']._force_archive_inactive_variants()
+        self.assertFalse(self.variant.active)
+        transition = self._transitions('cron')
+        self.assertEqual(len(transition), 1)
+        self.assertEqual((transition.old_state, transition.new_state), ('active', 'archived'))
+
+    def test_write_logs_transitions(self):
+        """Test that a direct change of the active flag is logged."""
+        self.variant.active = False
+        self.assertEqual(self._transitions('write').new_state, 'archived')
+
+    def test_append_only(self):
+        """Test that logged transitions cannot be modified."""
+        self.Transition._log_transitions('product.product', [(self.variant.id, True, False)], 'cron')
+        with self.assertRaises(UserError):
+            self._transitions('cron').write({'cause': 'write'})
+
+    def test_prune_transitions(self):
+        """Test that transitions older than the retention are pruned."""
+        self.Transition._log_transitions('product.product', [(self.variant.id, True, False)], 'cron')
+        self.env.cr.execute(
+            "UPDATE product_sale_window_transition SET timestamp = timestamp - interval '100 days' WHERE res_id = %s",
+            (self.variant.id,),
+        )
+        self.env['ir.config_parameter'].sudo().set_param('product_variant_dates.transition_retention_days', 90)
+        self.assertGreaterEqual(self.Transition._cron_prune_transitions(), 1)
+        self.assertFalse(self._transitions('cron'))
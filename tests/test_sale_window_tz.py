@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from odoo import fields
+
+from odoo.addons.product_variant_dates.tools.sale_period import localize_boundary
+from .common import SaleWindowTestCase
+
+
+class TestSaleWindowTimezone(SaleWindowTestCase):
+    """Test cases for per-website timezones of sale periods."""
+
+    def setUp(self):
+        super().setUp()
+        self.website = self.env['website'].create({
+            'name': 'EU Shop',
+            'sale_window_tz': 'Europe/Paris',
+        })
+        # Local midnight in Paris (UTC+2 in summer)
+        _template, values, variants = self._create_ticket('Timezone Ticket', {
+            'Summer': (datetime(2026, 6, 1, 0, 0), datetime(2026, 6, 30, 22, 0)),
+        })
+        self.value = values['Summer']
+        self.variant = variants['Summer']
+
+    def test_label_follows_website_timezone(self):
+        """Test that the sale period label uses the timezone of the website."""
+        self.assertIn('1st Jul', self.variant.with_context(website_id=self.website.id).sale_period_info)
+        self.assertIn('30th Jun', self.variant.with_context(website_id=False, tz='UTC').sale_period_info)
+
+    def test_website_timezone_defaults_to_company(self):
+        """Test that a website without timezone uses the timezone of its company."""
+        self.website.sale_window_tz = False
+        self.website.company_id.partner_id.tz = 'America/New_York'
+        self.assertEqual(self.website._get_sale_window_tz(), 'America/New_York')
+
+    def test_localized_boundaries_are_cached(self):
+        """Test that boundary conversions are computed once per timezone."""
+        localize_boundary.cache_clear()
+        for _attempt in range(3):
+            localize_boundary(datetime(2026, 6, 30, 22, 0), 'Europe/Paris')
+        self.assertEqual(localize_boundary.cache_info().misses, 1)
+        self.assertEqual(localize_boundary(datetime(2026, 6, 30, 22, 0), 'Europe/Paris'), datetime(2026, 7, 1, 0, 0))
+
+    def test_cron_triggered_at_next_transition(self):
+        """Test that the archive cron is scheduled at the next cut-over."""
+        cron = self.env.ref('product_variant_dates.cron_archive_inactive_variants')
+        end = fields.Datetime.now().replace(microsecond=0) + timedelta(minutes=10)
+        self.value.write({
+            'sale_start_date': end - timedelta(days=1),
+            'sale_end_date': end,
+        })
+        trigger = self.env['ir.cron.trigger'].search([('cron_id', '=', cron.id), ('call_at', '=', end)])
+        self.assertTrue(trigger)
+
+    def test_recurrence_follows_local_time(self):
+        """Test that recurring windows keep their local time and weekday across a DST change."""
+        # Saturday 00:30 in Paris is still Friday in UTC; DST starts on 2026-03-29
+        value = self.env['product.attribute.value'].create({
+            'name': 'Saturday Night',
+            'attribute_id': self.value.attribute_id.id,
+            'sale_start_date': datetime(2026, 3, 20, 23, 30),
+            'sale_recurrence_rule': 'FREQ=WEEKLY;BYDAY=SA',
+            'sale_recurrence_duration': 2.0,
+            'sale_recurrence_tz': 'Europe/Paris',
+        })
+        with patch.object(fields.Datetime, 'now', return_value=datetime(2026, 4, 3, 23, 0)):
+            value._compute_sale_window()
+        # Saturday 00:30 in Paris, now UTC+2
+        self.assertEqual(value.sale_window_start, datetime(2026, 4, 3, 22, 30))
+        self.assertEqual(value.sale_window_end, datetime(2026, 4, 4, 0, 30))
+
+    def test_recurrence_timezone_is_stored(self):
+        """Test that the recurrence does not depend on the user recomputing it."""
+        value = self.env['product.attribute.value'].with_context(tz='Asia/Tokyo').create({
+            'name': 'Tokyo Session',
+            'attribute_id': self.value.attribute_id.id,
+            'sale_start_date': datetime(2026, 3, 20, 23, 30),
+            'sale_recurrence_rule': 'FREQ=WEEKLY;BYDAY=SA',
+            'sale_recurrence_duration': 2.0,
+            'sale_recurrence_tz': 'Europe/Paris',
+        })
+        self.env.user.tz = 'Asia/Tokyo'
+        with patch.object(fields.Datetime, 'now', return_value=datetime(2026, 4, 3, 23, 0)):
+            value._compute_sale_window()
+        self.assertEqual(value.sale_window_start, datetime(2026, 4, 3, 22, 30))
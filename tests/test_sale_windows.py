@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest.mock import patch
+from odoo import fields
+from odoo.exceptions import ValidationError
+
+from .common import SaleWindowTestCase
+
+
+class TestSaleWindows(SaleWindowTestCase):
+    """Test cases for multiple and recurring sale windows on attribute values."""
+
+    def setUp(self):
+        super().setUp()
+        self.attribute = self.env['product.attribute'].create({
+            'name': 'Session',
+            'create_variant': 'always',
+        })
+
+    def _create_value(self, **vals):
+        return self.env['product.attribute.value'].create(dict({
+            'name': 'Weekly Session',
+            'attribute_id': self.attribute.id,
+            'sale_recurrence_tz': 'UTC',
+        }, **vals))
+
+    def test_single_window(self):
+        """Test that a single start/end pair is the window in effect."""
+        value = self._create_value(
+            sale_start_date=self.now - timedelta(days=1),
+            sale_end_date=self.now + timedelta(days=1),
+        )
+        self.assertEqual(value.sale_window_start, value.sale_start_date)
+        self.assertEqual(value.sale_window_end, value.sale_end_date)
+        self.assertEqual(value.sale_next_transition, value.sale_end_date)
+
+    def test_multiple_windows(self):
+        """Test that the current window wins, then the next one, then the last one."""
+        value = self._create_value(sale_window_ids=[
+            (0, 0, {'start_date': self.now - timedelta(days=10), 'end_date': self.now - timedelta(days=9)}),
+            (0, 0, {'start_date': self.now + timedelta(days=3), 'end_date': self.now + timedelta(days=4)}),
+        ])
+        self.assertEqual(value.sale_window_start, self.now + timedelta(days=3))
+        self.assertEqual(value.sale_next_transition, self.now + timedelta(days=3))
+        self.assertFalse(value.is_sale_period_active)
+
+        value.sale_window_ids = [(0, 0, {'start_date': self.now - timedelta(hours=1), 'end_date': self.now + timedelta(hours=1)})]
+        self.assertEqual(value.sale_window_end, self.now + timedelta(hours=1))
+        self.assertTrue(value.is_sale_period_active)
+
+    def test_recurring_window(self):
+        """Test that a recurrence rule yields the occurrence around now."""
+        value = self._create_value(
+            sale_start_date=self.now - timedelta(days=7, hours=1),
+            sale_recurrence_rule='FREQ=WEEKLY',
+            sale_recurrence_duration=2.0,
+        )
+        # The second weekly occurrence started an hour ago and lasts two hours
+        self.assertEqual(value.sale_window_start, self.now - timedelta(hours=1))
+        self.assertEqual(value.sale_window_end, self.now + timedelta(hours=1))
+        self.assertTrue(value.is_sale_period_active)
+
+    def test_ended_recurring_window(self):
+        """Test that a series that ended weeks ago keeps its last occurrence as a past window."""
+        value = self._create_value(
+            sale_start_date=self.now - timedelta(days=60),
+            sale_end_date=self.now - timedelta(days=21),
+            sale_recurrence_rule='FREQ=WEEKLY',
+            sale_recurrence_duration=2.0,
+        )
+        self.assertTrue(value.sale_window_start)
+        self.assertLess(value.sale_window_start, value.sale_end_date)
+        self.assertGreater(value.sale_window_start, value.sale_end_date - timedelta(days=7, hours=2))
+        self.assertEqual(value.sale_window_end, value.sale_window_start + timedelta(hours=2))
+        self.assertFalse(value.sale_next_transition)
+        self.assertFalse(value.is_sale_period_active)
+
+        # Recomputing after an edit keeps the series restricted
+        value.sale_recurrence_duration = 3.0
+        self.assertEqual(value.sale_window_end, value.sale_window_start + timedelta(hours=3))
+        self.assertFalse(value.is_sale_period_active)
+
+    def test_recurrence_requires_duration(self):
+        """Test that a recurrence rule without duration is rejected."""
+        with self.assertRaises(ValidationError):
+            self._create_value(sale_start_date=self.now, sale_recurrence_rule='FREQ=WEEKLY')
+
+    def _create_session_ticket(self, windows):
+        value = self._create_value(sale_window_ids=[
+            (0, 0, {'start_date': start, 'end_date': end}) for start, end in windows
+        ])
+        template = self.env['product.template'].create({'name': 'Session Ticket', 'type': 'consu'})
+        self.env['product.template.attribute.line'].create({
+            'product_tmpl_id': template.id,
+            'attribute_id': self.attribute.id,
+            'value_ids': [(6, 0, [value.id])],
+        })
+        return value, template.product_variant_ids
+
+    def _transitions(self, variant):
+        return self.env['product.sale.window.transition'].search([
+            ('res_model', '=', 'product.product'),
+            ('res_id', '=', variant.id),
+        ])
+
+    def test_cron_advances_windows(self):
+        """Test that the archive pass moves values past their next transition to their next window."""
+        value, variant = self._create_session_ticket([
+            (self.now - timedelta(hours=2), self.now + timedelta(hours=1)),
+            (self.now + timedelta(days=7), self.now + timedelta(days=8)),
+        ])
+        self.assertEqual(variant.sale_end_date, self.now + timedelta(hours=1))
+
+        later = self.now + timedelta(hours=2)
+        with patch.object(fields.Datetime, 'now', return_value=later):
+            planned = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+            result = self.env['product.product']._force_archive_inactive_variants()
+        self.assertEqual(value.sale_window_start, self.now + timedelta(days=7))
+        self.assertEqual(variant.sale_start_date, self.now + timedelta(days=7))
+        self.assertEqual(len(variant.product_tmpl_id.with_context(active_test=False).product_variant_ids), 1)
+        # The archiving is done, counted and logged by the pass, not by propagation
+        self.assertIn(variant.id, planned['archive_ids'])
+        self.assertEqual(result['archived'], planned['archived'])
+        self.assertFalse(variant.active)
+        self.assertEqual(self._transitions(variant).mapped('cause'), ['cron'])
+
+    def test_dry_run_simulates_advance(self):
+        """Test that the dry run plans with the windows the values are about to move to."""
+        value, variant = self._create_session_ticket([
+            (self.now - timedelta(hours=2), self.now + timedelta(hours=1)),
+            (self.now + timedelta(minutes=90), self.now + timedelta(hours=8)),
+        ])
+        later = self.now + timedelta(hours=2)
+        with patch.object(fields.Datetime, 'now', return_value=later):
+            # The stored window has ended, the next one has already started
+            planned = self.env['product.product']._force_archive_inactive_variants(dry_run=True)
+            self.assertEqual(variant.sale_end_date, self.now + timedelta(hours=1))
+            result = self.env['product.product']._force_archive_inactive_variants()
+        self.assertNotIn(variant.id, planned['archive_ids'])
+        self.assertEqual(result['archived'], planned['archived'])
+        self.assertEqual(result['reactivated'], planned['reactivated'])
+        self.assertEqual(variant.sale_end_date, self.now + timedelta(hours=8))
+        self.assertTrue(variant.active)
+        self.assertFalse(self._transitions(variant))
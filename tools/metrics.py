@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""In-memory counters exported by the sale-window metrics route.
+
+Counters are kept per worker process and exported with a ``worker`` label
+holding the process id. A scrape is answered by whichever worker handles the
+request, so each scrape only contains the series of that worker: the figures
+are a per-worker sample, not a total for the server, and Prometheus sees the
+series of the other workers go stale in between. Query them per worker
+(e.g. ``rate(...[5m])`` grouped by ``worker``) and expect new series when
+workers are recycled. Database figures are shared and carry no such label.
+"""
+
+import os
+import threading
+
+# Upper bounds (in seconds) of the combination-info latency histogram
+COMBINATION_INFO_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_lock = threading.Lock()
+_ribbon_lookups = {}
+_combination_info = {
+    'buckets': [0] * len(COMBINATION_INFO_BUCKETS),
+    'count': 0,
+    'sum': 0.0,
+}
+
+
+def record_ribbon_lookup(kind, hit):
+    """Count a ribbon lookup of the given kind ('variant' or 'template')."""
+    with _lock:
+        counters = _ribbon_lookups.setdefault(kind, {'hit': 0, 'miss': 0})
+        counters['hit' if hit else 'miss'] += 1
+
+
+def observe_combination_info(seconds):
+    """Record the duration of one ``_get_combination_info`` call."""
+    with _lock:
+        for index, bound in enumerate(COMBINATION_INFO_BUCKETS):
+            if seconds <= bound:
+                _combination_info['buckets'][index] += 1
+        _combination_info['count'] += 1
+        _combination_info['sum'] += seconds
+
+
+def snapshot():
+    """Return a consistent copy of the in-memory counters."""
+    with _lock:
+        return {
+            'ribbon_lookups': {kind: dict(counters) for kind, counters in _ribbon_lookups.items()},
+            'combination_info': {
+                'buckets': list(_combination_info['buckets']),
+                'count': _combination_info['count'],
+                'sum': _combination_info['sum'],
+            },
+        }
+
+
+def reset():
+    """Reset the in-memory counters (used by tests)."""
+    with _lock:
+        _ribbon_lookups.clear()
+        _combination_info['buckets'] = [0] * len(COMBINATION_INFO_BUCKETS)
+        _combination_info['count'] = 0
+        _combination_info['sum'] = 0.0
+
+
+def _format_value(value):
+    if value is None:
+        return 'NaN'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(aggregates):
+    """Render database aggregates and in-memory counters in the Prometheus text format.
+
+    :param dict aggregates: result of ``product.template._get_sale_window_metrics()``
+    :return: the exposition text
+    :rtype: str
+    """
+    counters = snapshot()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s %s' % (name, kind))
+        for labels, value in samples:
+            label_text = ','.join('%s="%s"' % item for item in labels)
+            lines.append('%s%s %s' % (name, '{%s}' % label_text if label_text else '', _format_value(value)))
+
+    for model_key, label in (('variants', 'variants'), ('templates', 'templates')):
+        metric(
+            'product_variant_dates_%s' % label, 'gauge',
+            'Number of %s per sale-window state.' % label,
+            [((('state', state),), count) for state, count in sorted(aggregates[model_key].items())],
+        )
+    metric(
+        'product_variant_dates_next_boundary_timestamp_seconds', 'gauge',
+        'Unix time of the next sale start or end date of any variant.',
+        [((), aggregates['next_boundary'])],
+    )
+
+    cron = aggregates.get('last_cron_run') or {}
+    metric(
+        'product_variant_dates_cron_last_run_timestamp_seconds', 'gauge',
+        'Unix time at which the last archive cron run finished.',
+        [((), cron.get('finished_at'))],
+    )
+    metric(
+        'product_variant_dates_cron_last_duration_seconds', 'gauge',
+        'Duration of the last archive cron run.',
+        [((), cron.get('duration'))],
+    )
+    metric(
+        'product_variant_dates_cron_last_transitions', 'gauge',
+        'Variants archived or reactivated by the last archive cron run.',
+        [((('action', 'archived'),), cron.get('archived')), ((('action', 'reactivated'),), cron.get('reactivated'))],
+    )
+
+    worker = str(os.getpid())
+    ribbon_samples = []
+    for kind, kind_counters in sorted(counters['ribbon_lookups'].items()):
+        for result in ('hit', 'miss'):
+            ribbon_samples.append(((('kind', kind), ('result', result), ('worker', worker)), kind_counters[result]))
+    metric(
+        'product_variant_dates_ribbon_lookups_total', 'counter',
+        'Sale-period ribbon lookups, by ribbon kind and whether an existing ribbon was reused.',
+        ribbon_samples,
+    )
+
+    histogram = counters['combination_info']
+    name = 'product_variant_dates_combination_info_seconds'
+    lines.append('# HELP %s Duration of product.template._get_combination_info calls.' % name)
+    lines.append('# TYPE %s histogram' % name)
+    for bound, count in zip(COMBINATION_INFO_BUCKETS, histogram['buckets']):
+        lines.append('%s_bucket{le="%s",worker="%s"} %d' % (name, bound, worker, count))
+    lines.append('%s_bucket{le="+Inf",worker="%s"} %d' % (name, worker, histogram['count']))
+    lines.append('%s_sum{worker="%s"} %s' % (name, worker, repr(histogram['sum'])))
+    lines.append('%s_count{worker="%s"} %d' % (name, worker, histogram['count']))
+
+    return '\n'.join(lines) + '\n'
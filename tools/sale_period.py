@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import functools
+from datetime import timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import pytz
+
+
+def get_sale_window_tz(env):
+    """Return the timezone in which sale periods are shown for the given environment.
+
+    On the website this is the timezone of the current website, elsewhere the
+    timezone of the context or of the user.
+    """
+    website_id = env.context.get('website_id')
+    if website_id:
+        return env['website'].sudo().browse(website_id)._get_sale_window_tz()
+    return env.context.get('tz') or env.user.tz or 'UTC'
+
+
+@functools.lru_cache(maxsize=64)
+def get_zone(tz_name):
+    """Return the ``zoneinfo`` timezone of the given name, UTC if unknown."""
+    try:
+        return ZoneInfo(tz_name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+@functools.lru_cache(maxsize=8192)
+def localize_boundary(boundary, tz_name):
+    """Convert a naive UTC sale boundary to the naive wall-clock time of a timezone.
+
+    Boundaries are shared by many variants and repeat on every page load, so
+    each (boundary, timezone) cut-over is converted once per process.
+    """
+    try:
+        tz = pytz.timezone(tz_name or 'UTC')
+    except pytz.UnknownTimeZoneError:
+        tz = pytz.utc
+    return pytz.utc.localize(boundary).astimezone(tz).replace(tzinfo=None)
+
+
+def format_sale_period_info(env, sale_end_date, tz_name='UTC'):
+    """Format a sale end date as the "Until 1st Jul" label shown to customers.
+
+    The label is translated in the language of ``env``.
+    """
+    if not sale_end_date:
+        return ''
+    local_end_date = localize_boundary(sale_end_date, tz_name)
+    day = local_end_date.day
+    month = local_end_date.strftime('%b')
+    if day in (1, 21, 31):
+        suffix = 'st'
+    elif day in (2, 22):
+        suffix = 'nd'
+    elif day in (3, 23):
+        suffix = 'rd'
+    else:
+        suffix = 'th'
+    return env._('Until %d%s %s', day, suffix, month)